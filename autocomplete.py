@@ -0,0 +1,182 @@
+"""
+Topic completion for the Chromehounds command autocomplete handlers.
+Topic lists are indexed once so each keystroke is a trie walk instead of a rebuild and scan.
+"""
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+# Discord limits autocomplete to 25 choices
+MAX_CHOICES = 25
+
+# How long an autocomplete session's candidates stay reusable, in seconds
+SESSION_TTL = 30.0
+
+# Maximum number of autocomplete sessions kept at once
+MAX_SESSIONS = 1024
+
+
+class _TrieNode:
+    """Trie node holding every topic (in sorted order) with a word starting with its prefix."""
+
+    __slots__ = ("children", "topic_ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.topic_ids: List[int] = []
+
+
+class TopicIndex:
+    """Prefix trie over the words of a sorted topic list, with an infix fallback."""
+
+    def __init__(self, topics: List[str], limit: int = MAX_CHOICES):
+        self.topics = list(topics)
+        self.limit = limit
+        self._lowered = [topic.lower() for topic in self.topics]
+        self._root = _TrieNode()
+
+        for topic_id, lowered in enumerate(self._lowered):
+            # Index the whole topic and every word start, so "gun" finds "Heavy Gunner"
+            starts = {0} | {i + 1 for i, char in enumerate(lowered) if char == " "}
+            for start in sorted(starts):
+                node = self._root
+                for char in lowered[start:]:
+                    node = node.children.setdefault(char, _TrieNode())
+                    if not node.topic_ids or node.topic_ids[-1] != topic_id:
+                        node.topic_ids.append(topic_id)
+
+        self._first_topics = self.topics[:limit]
+
+    def _prefix_ids(self, prefix: str) -> List[int]:
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.topic_ids
+
+    def candidate_ids(self, current: str) -> Tuple[List[int], bool]:
+        """
+        Return candidate topic ids for the input from the trie, scanning for infix matches only when needed.
+
+        Args:
+            current (str): Lowercased autocomplete input
+
+        Returns:
+            tuple: The candidate ids in sorted topic order, and whether they include every topic
+            containing the input (False when the word-start matches alone fill the choices)
+        """
+        topic_ids = self._prefix_ids(current)
+        if len(topic_ids) >= self.limit:
+            return list(topic_ids), False
+        return self.match_ids(current), True
+
+    def narrow(self, current: str, topic_ids: Sequence[int]) -> List[int]:
+        """
+        Return the ids among `topic_ids` whose topic contains the input, keeping their order.
+
+        Args:
+            current (str): Lowercased autocomplete input
+            topic_ids (Sequence[int]): Candidate topic ids in sorted topic order
+        """
+        lowered = self._lowered
+        return [topic_id for topic_id in topic_ids if current in lowered[topic_id]]
+
+    def match_ids(self, current: str) -> List[int]:
+        """Return the ids of every topic containing the input, in sorted topic order."""
+        current = current.lower()
+        if not current:
+            return list(range(len(self.topics)))
+        return self.narrow(current, range(len(self.topics)))
+
+    def choices(self, current: str, topic_ids: Sequence[int]) -> List[str]:
+        """Return up to `limit` of the matching topics, word-start matches before infix matches."""
+        word_start = f" {current}"
+        prefix_matches, infix_matches = [], []
+        for topic_id in topic_ids:
+            lowered = self._lowered[topic_id]
+            if lowered.startswith(current) or word_start in lowered:
+                prefix_matches.append(self.topics[topic_id])
+                if len(prefix_matches) >= self.limit:
+                    break
+            elif len(infix_matches) < self.limit:
+                infix_matches.append(self.topics[topic_id])
+        return (prefix_matches + infix_matches)[:self.limit]
+
+    def complete(self, current: str) -> List[str]:
+        """
+        Return up to `limit` topics for the current input.
+
+        Topics with a word starting with the input come first, followed by topics that
+        merely contain it, each group in sorted order.
+        """
+        current = current.lower()
+        if not current:
+            return self._first_topics
+
+        topic_ids = self._prefix_ids(current)
+        results = [self.topics[topic_id] for topic_id in topic_ids[:self.limit]]
+        if len(results) < self.limit:
+            seen = set(topic_ids)
+            for topic_id, lowered in enumerate(self._lowered):
+                if topic_id not in seen and current in lowered:
+                    results.append(self.topics[topic_id])
+                    if len(results) >= self.limit:
+                        break
+        return results
+
+
+class AutocompleteSessions:
+    """
+    Per-user, per-command cache of the last autocomplete input and its full candidate list.
+
+    Autocomplete input usually grows one keystroke at a time, so when the new input extends
+    the previous one only the previous candidates need to be filtered. New sessions start from
+    the topic index's trie; candidates that are only the word-start matches are looked up in
+    the trie again rather than filtered, since they can't provide infix matches.
+    """
+
+    def __init__(self, ttl: float = SESSION_TTL, max_sessions: int = MAX_SESSIONS):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[Hashable, Tuple[float, str, List[int], bool]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def clear(self):
+        """Drop every session, e.g. after the topic indexes are rebuilt."""
+        self._sessions.clear()
+
+    def _evict(self, now: float):
+        """Drop expired sessions and, if still over capacity, the least recently used ones."""
+        while self._sessions:
+            key, (timestamp, _, _, _) = next(iter(self._sessions.items()))
+            if now - timestamp <= self.ttl and len(self._sessions) <= self.max_sessions:
+                break
+            del self._sessions[key]
+
+    def complete(self, key: Hashable, index: TopicIndex, current: str) -> List[str]:
+        """
+        Return up to `index.limit` topics for the input, narrowing the session's previous candidates when possible.
+
+        Args:
+            key (Hashable): Session key, e.g. (user id, command name)
+            index (TopicIndex): Topic index the session belongs to
+            current (str): Autocomplete input
+        """
+        current = current.lower()
+        if not current:
+            self._sessions.pop(key, None)
+            return index.complete(current)
+
+        now = time.monotonic()
+        session: Optional[Tuple[float, str, List[int], bool]] = self._sessions.pop(key, None)
+        if session is not None and session[3] and now - session[0] <= self.ttl and current.startswith(session[1]):
+            topic_ids, exhaustive = index.narrow(current, session[2]), True
+        else:
+            topic_ids, exhaustive = index.candidate_ids(current)
+
+        self._sessions[key] = (now, current, topic_ids, exhaustive)
+        self._evict(now)
+        return index.choices(current, topic_ids)
@@ -0,0 +1,246 @@
+"""
+Offline benchmarks for the Chromehounds plugin.
+Measures search and topic extraction against the real corpus and synthetic corpora scaled up from it,
+and stores the results as JSON baselines that later runs can be compared against.
+
+Run with `python -m plugins.Chromehounds.bench --scales 1 10 100 --output baseline.json`.
+"""
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from . import data
+from .documents import compile_documents, get_topics
+from .search import SearchIndex
+
+# Queries per workload; each is run `repeat` times per measurement
+QUERY_SETS = {
+    "single": ["sniper", "radar", "tarakia", "cockpit", "artillery"],
+    "multi": ["heavy armor", "sniper cannon range", "communication tower", "sal kar hover legs"],
+    "miss": ["zzqx", "banana spaceship", "quux frobnicate"],
+    "fuzzy": ["snipr", "morskoy", "artilery", "comunication"]
+}
+
+DEFAULT_SCALES = (1, 10, 100, 1000)
+DEFAULT_REPEAT = 20
+
+# Fraction of words rewritten in each synthetic copy, so the vocabulary grows with the corpus
+MUTATION_RATE = 0.2
+
+
+def _mutate(value: Any, rng: random.Random, suffix: str) -> Any:
+    """Return a copy of a data value with the same shape and some of its words rewritten."""
+    if isinstance(value, str):
+        return " ".join(
+            f"{word}{suffix}" if rng.random() < MUTATION_RATE and word.isalpha() else word
+            for word in value.split(" ")
+        )
+    if isinstance(value, dict):
+        return {key: _mutate(item, rng, suffix) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_mutate(item, rng, suffix) for item in value]
+    return value
+
+
+def synthetic_corpus(search_spaces: Dict[str, dict], scale: int, seed: int = 0) -> Dict[str, dict]:
+    """
+    Build a corpus `scale` times the size of `search_spaces` with the same categories and entry shapes.
+
+    The first copy of every entry is the original; the others get suffixed keys and partly rewritten text.
+    """
+    rng = random.Random(seed)
+    corpus = {}
+    for category, entries in search_spaces.items():
+        scaled = {}
+        for copy in range(scale):
+            suffix = "" if copy == 0 else f"x{copy:x}"
+            for key, value in entries.items():
+                scaled[f"{key}_{suffix}" if suffix else key] = value if not suffix else _mutate(value, rng, suffix)
+        corpus[category] = scaled
+    return corpus
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of sorted samples."""
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, max(0, int(round(fraction * len(samples))) - 1))]
+
+
+def measure(func: Callable[[str], Any], queries: List[str], repeat: int) -> Dict[str, float]:
+    """
+    Time every query `repeat` times and report throughput, latency percentiles and peak traced memory.
+
+    Latencies are measured without tracemalloc running; peak memory comes from one extra traced pass.
+    """
+    for query in queries:
+        func(query)
+
+    samples = []
+    gc.collect()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            query_started = time.perf_counter()
+            func(query)
+            samples.append(time.perf_counter() - query_started)
+    elapsed = time.perf_counter() - started
+    samples.sort()
+
+    tracemalloc.start()
+    for query in queries:
+        func(query)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "queries": len(samples),
+        "ops_per_second": len(samples) / elapsed if elapsed else 0.0,
+        "mean": sum(samples) / len(samples),
+        "p50": percentile(samples, 0.50),
+        "p95": percentile(samples, 0.95),
+        "p99": percentile(samples, 0.99),
+        "max": samples[-1],
+        "peak_bytes": peak
+    }
+
+
+def build_index(search_spaces: Dict[str, dict]) -> Dict[str, Any]:
+    """Build an in-memory index, recording its build time and peak traced memory."""
+    gc.collect()
+    started = time.perf_counter()
+    index = SearchIndex(search_spaces)
+    build_seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    SearchIndex(search_spaces)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"index": index, "build_seconds": build_seconds, "build_peak_bytes": peak}
+
+
+def bench_topics(search_spaces: Dict[str, dict], repeat: int) -> Dict[str, float]:
+    """Time topic extraction for the category commands over the given corpus."""
+    documents = compile_documents(search_spaces)
+    scopes = {category: set(names) for category, names in data.CATEGORY_SCOPES.items()}
+    return measure(
+        lambda category: get_topics(document for document in documents if document.category in scopes[category]),
+        list(scopes),
+        repeat
+    )
+
+
+def bench_corpus(search_spaces: Dict[str, dict], repeat: int, topics: bool = True) -> Dict[str, Any]:
+    """Benchmark `search_chromehounds_data` (and optionally topic extraction) over one corpus."""
+    built = build_index(search_spaces)
+    index = built["index"]
+    result = {
+        "entries": len(index),
+        "terms": len(index.vocabulary),
+        "build_seconds": built["build_seconds"],
+        "build_peak_bytes": built["build_peak_bytes"],
+        "queries": {}
+    }
+
+    previous = data._search_index
+    data._search_index = index
+    try:
+        for name, queries in QUERY_SETS.items():
+            result["queries"][name] = measure(data.search_chromehounds_data, queries, repeat)
+    finally:
+        data._search_index = previous
+
+    if topics:
+        result["topics"] = bench_topics(search_spaces, repeat)
+    return result
+
+
+def run(scales: Sequence[int] = DEFAULT_SCALES, repeat: int = DEFAULT_REPEAT, seed: int = 0,
+        topics: bool = True, log: Callable[[str], None] = print) -> Dict[str, Any]:
+    """
+    Run the benchmark suite.
+
+    Args:
+        scales: Synthetic corpus sizes as multiples of the real corpus; 1 is the real corpus itself
+        repeat: How many times each query is timed
+        seed: Seed for the synthetic corpus generator
+        topics: Whether to benchmark topic extraction
+        log: Called with a progress line per corpus
+
+    Returns:
+        dict: Results keyed by corpus name, plus the environment they were measured in
+    """
+    results = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "corpora": {}
+    }
+    for scale in scales:
+        name = "real" if scale == 1 else f"x{scale}"
+        search_spaces = data.SEARCH_SPACES if scale == 1 else synthetic_corpus(data.SEARCH_SPACES, scale, seed)
+        corpus_result = results["corpora"][name] = bench_corpus(search_spaces, repeat, topics)
+        log(
+            f"{name}: {corpus_result['entries']} entries, built in {corpus_result['build_seconds'] * 1000:.1f}ms, "
+            + ", ".join(
+                f"{query_set} p50 {stats['p50'] * 1e6:.0f}us p99 {stats['p99'] * 1e6:.0f}us"
+                for query_set, stats in corpus_result["queries"].items()
+            )
+        )
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Describe how each workload's median latency and throughput changed relative to a baseline."""
+    lines = []
+    for name, corpus_result in results["corpora"].items():
+        base = baseline.get("corpora", {}).get(name)
+        if base is None:
+            continue
+        workloads = dict(corpus_result["queries"])
+        base_workloads = dict(base["queries"])
+        if "topics" in corpus_result and "topics" in base:
+            workloads["topics"] = corpus_result["topics"]
+            base_workloads["topics"] = base["topics"]
+        for workload, stats in workloads.items():
+            before = base_workloads.get(workload)
+            if not before or not before["p50"] or not before["ops_per_second"]:
+                continue
+            lines.append(
+                f"{name}/{workload}: p50 {stats['p50'] / before['p50']:.2f}x, "
+                f"throughput {stats['ops_per_second'] / before['ops_per_second']:.2f}x"
+            )
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Chromehounds search over real and synthetic corpora.")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES),
+                        help="corpus sizes as multiples of the real corpus (1 = real corpus)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per query")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic corpus seed")
+    parser.add_argument("--no-topics", action="store_true", help="skip topic extraction benchmarks")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare against a previously written JSON baseline")
+    args = parser.parse_args(argv)
+
+    results = run(args.scales, args.repeat, args.seed, topics=not args.no_topics)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline:
+            for line in compare(results, json.load(baseline)):
+                print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
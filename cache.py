@@ -0,0 +1,105 @@
+"""
+Caching helpers for the Chromehounds plugin.
+Keeps rendered responses for repeated queries so they aren't recomputed on every request.
+"""
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+def payload_size(value: Any) -> int:
+    """Approximate the memory cost of a JSON-serializable payload by its encoded length."""
+    return len(json.dumps(value, separators=(",", ":"), default=str))
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache with a TTL, a memory cap and hit/miss counters.
+
+    Entries belong to a data version; when `invalidate` sees a different version every
+    entry is dropped, so reloaded data never serves stale results.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 2_000_000, ttl: float = 600.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.version: Optional[Hashable] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def clear(self):
+        """Drop every entry, keeping the counters."""
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def invalidate(self, version: Hashable):
+        """Drop every entry if the data version has changed."""
+        if version != self.version:
+            self.clear()
+            self.version = version
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for a key, or None if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        timestamp, size, value = entry
+        if time.monotonic() - timestamp > self.ttl:
+            del self._entries[key]
+            self.total_bytes -= size
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None):
+        """
+        Store a value, evicting the least recently used entries to stay within the limits.
+
+        Args:
+            key (Hashable): Cache key
+            value (Any): Value to store
+            size (Optional[int]): Approximate size in bytes, computed from the value if omitted
+        """
+        if size is None:
+            size = payload_size(value)
+        if size > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.total_bytes -= previous[1]
+
+        self._entries[key] = (time.monotonic(), size, value)
+        self.total_bytes += size
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache counters and current usage."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
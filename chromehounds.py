@@ -2,42 +2,84 @@
 Chromehounds Information Plugin for Logamus Bot.
 This plugin provides comprehensive information about the Chromehounds game including lore, mechanics, parts, and strategies.
 """
+import time
+
+_import_started = time.perf_counter()
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Mapping, Optional, Sequence, Tuple
+from types import MappingProxyType
 import asyncio
+import importlib.util
+import os
 import re
 
 from plugins import Plugin
-from .data import (
-    LORE_DATA,
-    ROLE_TYPES,
-    EQUIPMENT_DATA,
-    COMBAT_SYSTEMS,
-    NATIONS_DATA,
-    ORGANIZATIONS_DATA,
-    HISTORICAL_DATA,
-    COMMUNICATION_DATA,
-    ONLINE_FEATURES,
-    TECHNICAL_DATA,
-    LEGACY_DATA,
-    MECHANICS_DATA,
-    search_chromehounds_data,
-    get_quick_suggestions
-)
+from .corpus import corpus
+from .documents import PATH_SEPARATOR, Document, get_topics
+from .executor import QueryExecutor, QueryQueueFull, SingleFlight
+from .exporter import MetricsServer, format_histograms, format_metric
+from .metrics import Metrics
+from .querylog import QueryLog
+from .reload import DataReloader
+from .autocomplete import AutocompleteSessions, TopicIndex
+from .cache import LRUCache, payload_size
+from .query import normalize_query
+
+# Discord embed limits
+EMBED_FIELD_LIMIT = 1024
+EMBED_MAX_FIELDS = 25
+EMBED_TOTAL_LIMIT = 6000
+
+def chunk_lines(lines: List[str], limit: int) -> List[str]:
+    """Join lines into newline-separated chunks of at most `limit` characters, truncating any single line that is longer."""
+    chunks = []
+    current = ""
+    for line in lines:
+        line = line[:limit]
+        if current and len(current) + 1 + len(line) > limit:
+            chunks.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        chunks.append(current)
+    return chunks
+
+# Seconds between checks for changed game data; 0 disables hot reload
+HOT_RELOAD_INTERVAL = float(os.environ.get("CHROMEHOUNDS_HOT_RELOAD_INTERVAL") or 0)
+
+# Query executor settings: "inline" or "thread" mode, pool size, queue depth and the
+# estimated query cost (postings touched) above which work leaves the event loop
+EXECUTOR_MODE = os.environ.get("CHROMEHOUNDS_EXECUTOR_MODE", "thread")
+EXECUTOR_WORKERS = int(os.environ.get("CHROMEHOUNDS_EXECUTOR_WORKERS") or 2)
+EXECUTOR_QUEUE = int(os.environ.get("CHROMEHOUNDS_EXECUTOR_QUEUE") or 32)
+EXECUTOR_COST_THRESHOLD = float(os.environ.get("CHROMEHOUNDS_EXECUTOR_COST_THRESHOLD") or 20000)
+
+# JSON file the latency metrics are written to on cleanup (unset to skip)
+METRICS_DUMP_PATH = os.environ.get("CHROMEHOUNDS_METRICS_DUMP")
 
-def get_topics_from_data(data_sources: List[dict]) -> List[str]:
-    """Extract all available topics from data sources."""
-    topics = set()
-    for source in data_sources:
-        for key, value in source.items():
-            if isinstance(value, dict) and "title" in value:
-                topics.add(value["title"])
-            else:
-                topics.add(key.replace("_", " ").title())
-    return sorted(list(topics))
+# Opt-in log of normalized queries for offline replay (unset to disable)
+QUERY_LOG_PATH = os.environ.get("CHROMEHOUNDS_QUERY_LOG")
+
+# Local Prometheus endpoint (unset port to disable)
+METRICS_HOST = os.environ.get("CHROMEHOUNDS_METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("CHROMEHOUNDS_METRICS_PORT") or 0)
+
+# Category commands, each backed by the search spaces in data.CATEGORY_SCOPES
+CATEGORY_COMMANDS = ("lore", "mechanics", "parts", "strategy")
+
+# Error embed text for unknown keys in the fixed-key commands
+INVALID_KEY_MESSAGES = {
+    "hound_role": ("Invalid Role Type", "Please choose from: soldier, sniper, defender, scout, heavy_gunner, commander"),
+    "equipment": ("Invalid Equipment Category", "Please choose from: weapons, mobility, support"),
+    "mechanics": ("Invalid Mechanic Aspect", "Please choose from: combat, customization, damage"),
+    "communication": ("Invalid Communication System", "Please choose from: combas, network_areas, commander_systems"),
+    "online": ("Invalid Online Feature", "Please choose from: neroimus_war, squad_mechanics, territory_control")
+}
 
 class ChromehoundsInfo(Plugin):
     """Plugin for providing Chromehounds game information."""
@@ -50,6 +92,23 @@ class ChromehoundsInfo(Plugin):
         super().__init__(bot)
         self.logger = logging.getLogger("plugins.chromehounds_info")
         self.chromehounds_group = None
+        self.topic_indexes: Dict[str, TopicIndex] = {}
+        self.autocomplete_sessions = AutocompleteSessions()
+        self.search_cache = LRUCache()
+        self.overview_cache = LRUCache(max_entries=len(CATEGORY_COMMANDS), ttl=float("inf"))
+        self.static_embeds: Mapping[str, Mapping[str, discord.Embed]] = MappingProxyType({})
+        self.invalid_embeds: Mapping[str, discord.Embed] = MappingProxyType({})
+        self.data_reloader: Optional[DataReloader] = None
+        self.executor = QueryExecutor(
+            mode=EXECUTOR_MODE,
+            max_workers=EXECUTOR_WORKERS,
+            max_queue=EXECUTOR_QUEUE,
+            cost_threshold=EXECUTOR_COST_THRESHOLD
+        )
+        self.coalescer = SingleFlight()
+        self.metrics = Metrics()
+        self.metrics_server: Optional[MetricsServer] = None
+        self.query_log: Optional[QueryLog] = QueryLog(QUERY_LOG_PATH) if QUERY_LOG_PATH else None
         self._setup_commands()
         
     def _setup_commands(self):
@@ -61,6 +120,10 @@ class ChromehoundsInfo(Plugin):
             for command in self.chromehounds_group.commands:
                 self.bot.tree.remove_command(command.name)
         
+        # Topic indexes for the autocomplete handlers are rebuilt on first use
+        self.topic_indexes = {}
+        self.autocomplete_sessions.clear()
+        
         # Main command group
         self.chromehounds_group = app_commands.Group(
             name="chromehounds",
@@ -77,67 +140,95 @@ class ChromehoundsInfo(Plugin):
         @self.chromehounds_group.command(name="lore", description="Get lore and background information")
         @app_commands.describe(topic="The lore topic to learn about")
         async def lore(interaction: discord.Interaction, topic: Optional[str] = None):
-            await self._handle_category(interaction, "lore", topic, [LORE_DATA, NATIONS_DATA, ORGANIZATIONS_DATA, HISTORICAL_DATA])
+            await self._handle_category(interaction, "lore", topic, corpus.CATEGORY_SCOPES["lore"])
             
         @lore.autocomplete("topic")
         async def lore_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
-            topics = get_topics_from_data([LORE_DATA, NATIONS_DATA, ORGANIZATIONS_DATA, HISTORICAL_DATA])
-            return [
-                app_commands.Choice(name=topic, value=topic)
-                for topic in topics
-                if current.lower() in topic.lower()
-            ][:25]  # Discord limits to 25 choices
+            return self._autocomplete_topics(interaction, "lore", current)
             
         @self.chromehounds_group.command(name="mechanics", description="Get game mechanics information")
         @app_commands.describe(topic="The mechanic topic to learn about")
         async def mechanics(interaction: discord.Interaction, topic: Optional[str] = None):
-            await self._handle_category(interaction, "mechanics", topic, [MECHANICS_DATA, COMBAT_SYSTEMS, COMMUNICATION_DATA])
+            await self._handle_category(interaction, "mechanics", topic, corpus.CATEGORY_SCOPES["mechanics"])
             
         @mechanics.autocomplete("topic")
         async def mechanics_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
-            topics = get_topics_from_data([MECHANICS_DATA, COMBAT_SYSTEMS, COMMUNICATION_DATA])
-            return [
-                app_commands.Choice(name=topic, value=topic)
-                for topic in topics
-                if current.lower() in topic.lower()
-            ][:25]
+            return self._autocomplete_topics(interaction, "mechanics", current)
             
         @self.chromehounds_group.command(name="parts", description="Get parts and equipment information")
         @app_commands.describe(topic="The equipment topic to learn about")
         async def parts(interaction: discord.Interaction, topic: Optional[str] = None):
-            await self._handle_category(interaction, "parts", topic, [EQUIPMENT_DATA, ROLE_TYPES])
+            await self._handle_category(interaction, "parts", topic, corpus.CATEGORY_SCOPES["parts"])
             
         @parts.autocomplete("topic")
         async def parts_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
-            topics = get_topics_from_data([EQUIPMENT_DATA, ROLE_TYPES])
-            return [
-                app_commands.Choice(name=topic, value=topic)
-                for topic in topics
-                if current.lower() in topic.lower()
-            ][:25]
+            return self._autocomplete_topics(interaction, "parts", current)
             
         @self.chromehounds_group.command(name="strategy", description="Get tactical and strategic information")
         @app_commands.describe(topic="The strategy topic to learn about")
         async def strategy(interaction: discord.Interaction, topic: Optional[str] = None):
-            await self._handle_category(interaction, "strategy", topic, [ROLE_TYPES, COMBAT_SYSTEMS])
+            await self._handle_category(interaction, "strategy", topic, corpus.CATEGORY_SCOPES["strategy"])
             
         @strategy.autocomplete("topic")
         async def strategy_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
-            topics = get_topics_from_data([ROLE_TYPES, COMBAT_SYSTEMS])
-            return [
-                app_commands.Choice(name=topic, value=topic)
-                for topic in topics
-                if current.lower() in topic.lower()
-            ][:25]
+            return self._autocomplete_topics(interaction, "strategy", current)
+        
+        @self.chromehounds_group.command(name="stats", description="Show Chromehounds plugin latency statistics")
+        async def stats(interaction: discord.Interaction):
+            await interaction.response.send_message(embed=self._stats_embed(), ephemeral=True)
         
         # Add the command group to the bot
         self.bot.tree.add_command(self.chromehounds_group)
         
+    def _topic_index(self, category: str) -> TopicIndex:
+        """Return a category command's topic index, building it on first use."""
+        index = self.topic_indexes.get(category)
+        if index is None:
+            documents = [document for name in corpus.CATEGORY_SCOPES[category] for document in corpus.category(name)]
+            index = self.topic_indexes[category] = TopicIndex(get_topics(documents))
+        return index
+        
+    def _autocomplete_topics(self, interaction: discord.Interaction, category: str, current: str) -> List[app_commands.Choice[str]]:
+        """Return autocomplete choices for a category command's topic, narrowing the user's previous input."""
+        started = time.perf_counter()
+        topics = self.autocomplete_sessions.complete(
+            (interaction.user.id, category),
+            self._topic_index(category),
+            current
+        )
+        choices = [app_commands.Choice(name=topic, value=topic) for topic in topics]
+        self._record_query(f"{category}_autocomplete", current, time.perf_counter() - started)
+        return choices
+        
     async def setup(self):
         """Set up the plugin."""
         try:
             self.logger.info("Setting up Chromehounds Information plugin...")
-            import aiohttp
+            if importlib.util.find_spec("aiohttp") is None:
+                raise ImportError("No module named 'aiohttp'")
+            self.logger.info(f"Plugin module imported in {IMPORT_TIME * 1000:.1f}ms")
+            
+            started = time.perf_counter()
+            index = corpus.get_search_index()
+            self.logger.info(f"Search index ready: {type(index).__name__} with {len(index)} entries")
+            self._render_static_embeds()
+            if METRICS_PORT:
+                self.metrics_server = MetricsServer(self._prometheus_text, host=METRICS_HOST, port=METRICS_PORT)
+                try:
+                    await self.metrics_server.start()
+                except OSError as e:
+                    # The endpoint is optional; a taken port shouldn't keep the commands from loading
+                    self.logger.warning(f"Metrics endpoint disabled, could not listen on {METRICS_HOST}:{METRICS_PORT}: {str(e)}")
+                    self.metrics_server = None
+            # Started last, so no failure above leaves it running
+            if HOT_RELOAD_INTERVAL > 0:
+                self.data_reloader = DataReloader(corpus, self._on_data_reload, interval=HOT_RELOAD_INTERVAL)
+                self.data_reloader.start()
+                self.logger.info(f"Watching game data for changes every {HOT_RELOAD_INTERVAL:g}s")
+            self.logger.info(
+                f"Game data loaded on first use in {corpus.timings.get('load', 0.0) * 1000:.1f}ms, "
+                f"setup warm-up took {(time.perf_counter() - started) * 1000:.1f}ms"
+            )
             self.logger.info("Chromehounds Information plugin setup complete!")
             return True
         except ImportError as e:
@@ -147,13 +238,154 @@ class ChromehoundsInfo(Plugin):
             self.logger.error(f"Error during plugin setup: {str(e)}")
             return False
             
+    def _stats_embed(self) -> discord.Embed:
+        """Render per-command, per-stage latency percentiles."""
+        embed = discord.Embed(
+            title="Chromehounds Plugin Statistics",
+            description="Latency per command and stage (p50 / p95 / p99).",
+            color=discord.Color.blue()
+        )
+        for command, stages in self.metrics.snapshot().items():
+            lines = [
+                f"`{stage}` n={summary['count']} "
+                f"{summary['p50'] * 1000:.1f} / {summary['p95'] * 1000:.1f} / {summary['p99'] * 1000:.1f} ms"
+                for stage, summary in stages.items()
+            ]
+            for chunk in chunk_lines(lines, EMBED_FIELD_LIMIT):
+                if len(embed.fields) >= EMBED_MAX_FIELDS - 1:
+                    break
+                embed.add_field(name=command, value=chunk, inline=False)
+        cache = self.search_cache.stats()
+        embed.add_field(
+            name="Search Cache",
+            value=f"{cache['entries']} entries, {cache['hits']} hits, {cache['misses']} misses ({cache['hit_ratio']:.0%})",
+            inline=False
+        )
+        return embed
+        
+    def _prometheus_text(self) -> str:
+        """Render the plugin's metrics in the Prometheus text format."""
+        histograms = self.metrics.histogram_items()
+        counters = self.metrics.counter_items()
+        index = corpus.get_search_index() if corpus.loaded else None
+        caches = {"search": self.search_cache.stats(), "overview": self.overview_cache.stats()}
+        coalescing = self.coalescer.stats()
+        
+        lines = format_histograms(
+            "chromehounds_stage_latency_seconds",
+            "Time spent in each stage of a command.",
+            (({"command": command, "stage": stage}, histogram) for (command, stage), histogram in histograms)
+        )
+        lines += format_metric(
+            "chromehounds_queries_total", "counter", "Completed command invocations.",
+            [({"command": command}, histogram.count) for (command, stage), histogram in histograms if stage == "total"]
+        )
+        for name, help_text in (("errors", "Command invocations that raised an error."),
+                                ("rejected", "Queries rejected because the executor queue was full.")):
+            lines += format_metric(
+                f"chromehounds_{name}_total", "counter", help_text,
+                [({"command": command}, value) for (command, counter), value in counters if counter == name]
+            )
+        for name, kind, help_text in (("hits", "counter", "Cache hits."),
+                                      ("misses", "counter", "Cache misses."),
+                                      ("evictions", "counter", "Cache evictions."),
+                                      ("entries", "gauge", "Cached entries."),
+                                      ("bytes", "gauge", "Approximate cached payload size."),
+                                      ("hit_ratio", "gauge", "Cache hit ratio.")):
+            metric = f"chromehounds_cache_{name}" + ("_total" if kind == "counter" else "")
+            lines += format_metric(metric, kind, help_text, [({"cache": cache}, stats[name]) for cache, stats in caches.items()])
+        lines += format_metric(
+            "chromehounds_coalesced_requests_total", "counter", "Requests served by another request's computation.",
+            [({}, coalescing["saved"])]
+        )
+        lines += format_metric(
+            "chromehounds_executor_offloaded_total", "counter", "Queries run in the thread pool.",
+            [({}, self.executor.offloaded)]
+        )
+        if index is not None:
+            lines += format_metric("chromehounds_index_entries", "gauge", "Entries in the search index.", [({}, len(index))])
+            lines += format_metric("chromehounds_index_version", "gauge", "Version of the installed search index.", [({}, index.version)])
+            vocabulary = getattr(index, "vocabulary", None)
+            if vocabulary is not None:
+                lines += format_metric("chromehounds_index_terms", "gauge", "Distinct terms in the search index.", [({}, len(vocabulary))])
+        return "\n".join(lines) + "\n"
+        
+    def _on_data_reload(self, version: int):
+        """Drop state derived from the previous game data after a hot reload."""
+        self.topic_indexes = {}
+        self.autocomplete_sessions.clear()
+        self._render_static_embeds()
+        
     async def _handle_search(self, interaction: discord.Interaction, query: str):
         """Handle the search command."""
-        await interaction.response.defer()
+        started = time.perf_counter()
+        try:
+            with self.metrics.time("search", "defer"):
+                await interaction.response.defer()
+            try:
+                embed = await self._search_embed(query)
+            except QueryQueueFull:
+                self.metrics.increment("search", "rejected")
+                embed = self._busy_embed()
+            with self.metrics.time("search", "send"):
+                await interaction.followup.send(embed=embed)
+        except Exception:
+            self.metrics.increment("search", "errors")
+            raise
+        self._record_query("search", query, time.perf_counter() - started)
+        
+    def _record_query(self, command: str, query: Optional[str], seconds: float):
+        """Record a served query's total latency, and capture it in the query log if enabled."""
+        self.metrics.observe(command, "total", seconds)
+        if self.query_log is not None:
+            self.query_log.record(command, query, seconds)
         
-        results = search_chromehounds_data(query)
+    def _busy_embed(self) -> discord.Embed:
+        """Embed sent when too many expensive queries are already queued."""
+        return discord.Embed(
+            title="Search Busy",
+            description="Too many searches are running right now. Please try again in a moment.",
+            color=discord.Color.red()
+        )
+        
+    async def _search_embed(self, query: str) -> discord.Embed:
+        """Build the search response embed, reusing the cached payload for repeated queries."""
+        index = corpus.get_search_index()
+        self.search_cache.invalidate(index.version)
+        key = normalize_query(query)
+        cached = self.search_cache.get(key)
+        if cached is None:
+            # Identical searches arriving together on the same index version share one computation
+            cached = await self.coalescer.run(("search", index.version, key), lambda: self._compute_search(query, key, index))
+        
+        found, payload = cached
+        embed = discord.Embed.from_dict(payload)
+        if found:
+            embed.title = f"Search Results: {query}"
+        else:
+            embed.description = f"No results found for '{query}'. Here are some suggested topics:"
+        return embed
+        
+    async def _compute_search(self, query: str, key: str, index) -> Tuple[bool, dict]:
+        """Run and render a search that missed the cache, then cache its payload if the index is still current."""
+        found, embed = await self.executor.run(self._render_search, query, index, cost=index.estimate_cost(query))
+        payload = embed.to_dict()
+        # A reload during the search moved the cache to a newer version; don't store stale results under it
+        if index.version == self.search_cache.version:
+            self.search_cache.put(key, (found, payload))
+        return found, payload
+        
+    def _render_search(self, query: str, index) -> Tuple[bool, discord.Embed]:
+        """Search the given index and render the results embed. May run in a worker thread."""
+        with self.metrics.time("search", "search"):
+            results = corpus.search_chromehounds_data(query, index)
+        with self.metrics.time("search", "render"):
+            return self._render_search_results(query, results)
+        
+    def _render_search_results(self, query: str, results: List[Document]) -> Tuple[bool, discord.Embed]:
+        """Render search results, returning whether anything was found."""
         if not results:
-            suggestions = get_quick_suggestions()
+            suggestions = corpus.get_quick_suggestions()
             embed = discord.Embed(
                 title="No Results Found",
                 description=f"No results found for '{query}'. Here are some suggested topics:",
@@ -170,71 +402,191 @@ class ChromehoundsInfo(Plugin):
                 color=discord.Color.blue()
             )
             for result in results:
-                embed.add_field(
-                    name=result["title"],
-                    value=result["content"][:1024] if "content" in result else result["description"][:1024],
-                    inline=False
-                )
+                embed.add_field(name=result.title, value=result.body[:EMBED_FIELD_LIMIT], inline=False)
+        return bool(results), embed
+        
+    def _overview_embeds(self, category: str) -> List[discord.Embed]:
+        """Return the category overview pages, rendering them only when the data version changes."""
+        self.overview_cache.invalidate(corpus.get_search_index().version)
+        embeds = self.overview_cache.get(category)
+        if embeds is None:
+            embeds = self._render_overview(category)
+            self.overview_cache.put(category, embeds, size=payload_size([embed.to_dict() for embed in embeds]))
+        return embeds
+        
+    def _render_overview(self, category: str) -> List[discord.Embed]:
+        """Render the category overview, splitting the topic list across fields and pages to fit Discord's limits."""
+        usage = f"Use `/chromehounds {category} <topic>` to get detailed information about a specific topic."
+        
+        def new_page(page: int) -> discord.Embed:
+            title = f"Chromehounds {category.title()} Information"
+            return discord.Embed(
+                title=title if page == 1 else f"{title} (page {page})",
+                description=f"Available topics in {category}:",
+                color=discord.Color.blue()
+            )
+        
+        pages = [new_page(1)]
+        page_length = len(pages[0].title) + len(pages[0].description)
+        topics = self._topic_index(category).topics
+        for number, chunk in enumerate(chunk_lines([f"• {topic}" for topic in topics], EMBED_FIELD_LIMIT)):
+            name = "Topics" if number == 0 else "Topics (cont.)"
+            # Leave room for the usage field on the last page
+            if len(pages[-1].fields) >= EMBED_MAX_FIELDS - 1 or \
+               page_length + len(name) + len(chunk) + len("Usage") + len(usage) > EMBED_TOTAL_LIMIT:
+                pages.append(new_page(len(pages) + 1))
+                page_length = len(pages[-1].title) + len(pages[-1].description)
+            pages[-1].add_field(name=name, value=chunk, inline=False)
+            page_length += len(name) + len(chunk)
         
-        await interaction.followup.send(embed=embed)
+        pages[-1].add_field(name="Usage", value=usage, inline=False)
+        return pages
         
-    async def _handle_category(self, interaction: discord.Interaction, category: str, topic: Optional[str], data_sources: List[dict]):
+    async def _handle_category(self, interaction: discord.Interaction, category: str, topic: Optional[str], scope: Sequence[str]):
         """Handle category-specific commands."""
-        await interaction.response.defer()
+        started = time.perf_counter()
+        try:
+            with self.metrics.time(category, "defer"):
+                await interaction.response.defer()
+            await self._send_category(interaction, category, topic, scope)
+        except Exception:
+            self.metrics.increment(category, "errors")
+            raise
+        self._record_query(category, topic, time.perf_counter() - started)
         
+    async def _send_category(self, interaction: discord.Interaction, category: str, topic: Optional[str], scope: Sequence[str]):
+        """Send the overview or the topic results for a category command."""
         if not topic:
-            # Show category overview
+            # Show category overview, one message per page
+            with self.metrics.time(category, "render"):
+                embeds = self._overview_embeds(category)
+        else:
+            # Search for specific topic within the category's data
+            try:
+                index = corpus.get_search_index()
+                found, embed = await self.coalescer.run(
+                    ("category", index.version, category, normalize_query(topic)),
+                    lambda: self.executor.run(
+                        self._render_category_topic, category, topic, scope, index,
+                        cost=index.estimate_cost(topic)
+                    )
+                )
+                # The shared embed may have been rendered for another spelling of the topic
+                embed = embed.copy()
+                if found:
+                    embed.title = f"{category.title()} Information: {topic}"
+                else:
+                    embed.description = self._no_category_results(category, topic)
+            except QueryQueueFull:
+                self.metrics.increment(category, "rejected")
+                embed = self._busy_embed()
+            embeds = [embed]
+        
+        # One send sample per command, however many pages it takes
+        with self.metrics.time(category, "send"):
+            for embed in embeds:
+                await interaction.followup.send(embed=embed)
+        
+    def _no_category_results(self, category: str, topic: str) -> str:
+        return f"No results found for '{topic}' in {category}. Try using broader terms or check the category overview with `/chromehounds {category}`"
+        
+    def _render_category_topic(self, category: str, topic: str, scope: Sequence[str], index) -> Tuple[bool, discord.Embed]:
+        """Search the given index's category for a topic and render the results embed. May run in a worker thread."""
+        with self.metrics.time(category, "search"):
+            results = corpus.search_category_data(topic, scope, limit=5, index=index)
+        with self.metrics.time(category, "render"):
+            return self._render_category_results(category, topic, results)
+        
+    def _render_category_results(self, category: str, topic: str, results: List[Document]) -> Tuple[bool, discord.Embed]:
+        """Render category topic results, returning whether anything was found."""
+
+        if not results:
             embed = discord.Embed(
-                title=f"Chromehounds {category.title()} Information",
-                description=f"Available topics in {category}:",
+                title=f"No {category.title()} Results",
+                description=self._no_category_results(category, topic),
                 color=discord.Color.blue()
             )
-            
-            # Collect all available topics from data sources
-            topics = get_topics_from_data(data_sources)
-            
-            embed.add_field(
-                name="Topics",
-                value="\n".join(f"• {topic}" for topic in topics),
-                inline=False
+        else:
+            embed = discord.Embed(
+                title=f"{category.title()} Information: {topic}",
+                color=discord.Color.blue()
             )
-            embed.add_field(
-                name="Usage",
-                value=f"Use `/chromehounds {category} <topic>` to get detailed information about a specific topic.",
-                inline=False
+            for result in results:
+                embed.add_field(name=result.title, value=result.body[:EMBED_FIELD_LIMIT], inline=False)
+        return bool(results), embed
+
+    def _render_static_embeds(self):
+        """Render every embed the fixed-key commands can send, keyed by command and key."""
+        static_embeds = {}
+        
+        static_embeds["hound_role"] = {
+            document.key: discord.Embed(
+                title=f"HOUND Role: {document.title}",
+                description=document.body,
+                color=discord.Color.blue()
             )
-        else:
-            # Search for specific topic
-            results = []
-            topic_lower = topic.lower()
-            
-            for source in data_sources:
-                for key, value in source.items():
-                    if isinstance(value, dict):
-                        if ("title" in value and topic_lower in value["title"].lower()) or \
-                           ("content" in value and topic_lower in value["content"].lower()) or \
-                           ("description" in value and topic_lower in value["description"].lower()):
-                            results.append(value)
-            
-            if not results:
-                embed = discord.Embed(
-                    title=f"No {category.title()} Results",
-                    description=f"No results found for '{topic}' in {category}. Try using broader terms or check the category overview with `/chromehounds {category}`",
+            for document in corpus.category("roles")
+            if document.parent is None
+        }
+        
+        equipment_embeds = {}
+        for document in corpus.category("equipment"):
+            if document.parent is None:
+                embed = equipment_embeds[document.key] = discord.Embed(
+                    title=f"HOUND Equipment: {document.key.title()}",
+                    description=document.body,
                     color=discord.Color.blue()
                 )
-            else:
-                embed = discord.Embed(
-                    title=f"{category.title()} Information: {topic}",
+                for label, items in document.sections:
+                    embed.add_field(name=label, value="\n".join(f"• {item}" for item in items)[:EMBED_FIELD_LIMIT], inline=False)
+            elif len(equipment_embeds[document.key].fields) < EMBED_MAX_FIELDS:
+                # Sub-sections follow their entry, one field each
+                equipment_embeds[document.key].add_field(
+                    name=PATH_SEPARATOR.join(document.path),
+                    value=document.body[:EMBED_FIELD_LIMIT],
+                    inline=False
+                )
+        static_embeds["equipment"] = equipment_embeds
+        
+        for command, category in (("mechanics", "mechanics"), ("communication", "communication"), ("online", "online")):
+            static_embeds[command] = {
+                document.key: discord.Embed(
+                    title=document.title,
+                    description=document.body,
                     color=discord.Color.blue()
                 )
-                for result in results[:5]:  # Show top 5 results
-                    embed.add_field(
-                        name=result["title"],
-                        value=result["content"][:1024] if "content" in result else result["description"][:1024],
-                        inline=False
-                    )
+                for document in corpus.category(category)
+                if document.parent is None
+            }
         
-        await interaction.followup.send(embed=embed)
+        invalid_embeds = {
+            command: discord.Embed(title=title, description=description, color=discord.Color.red())
+            for command, (title, description) in INVALID_KEY_MESSAGES.items()
+        }
+        
+        self.static_embeds = MappingProxyType({
+            command: MappingProxyType(embeds) for command, embeds in static_embeds.items()
+        })
+        self.invalid_embeds = MappingProxyType(invalid_embeds)
+        
+    def _static_embed(self, command: str, key: str) -> discord.Embed:
+        """Return the prerendered embed for a fixed-key command, or its error embed for an unknown key."""
+        if not self.static_embeds:
+            self._render_static_embeds()
+        embed = self.static_embeds[command].get(key.lower())
+        return embed if embed is not None else self.invalid_embeds[command]
+
+    async def _send_static(self, interaction: discord.Interaction, command: str, key: str):
+        """Send a fixed-key command's prerendered embed, timing the lookup and the send."""
+        started = time.perf_counter()
+        try:
+            embed = self._static_embed(command, key)
+            with self.metrics.time(command, "send"):
+                await interaction.response.send_message(embed=embed)
+        except Exception:
+            self.metrics.increment(command, "errors")
+            raise
+        self.metrics.observe(command, "total", time.perf_counter() - started)
 
     @app_commands.command(
         name="hound_role",
@@ -249,23 +601,7 @@ class ChromehoundsInfo(Plugin):
         role: str
     ):
         """Get detailed information about a specific HOUND role type."""
-        role = role.lower()
-        
-        if role not in ROLE_TYPES:
-            embed = discord.Embed(
-                title="Invalid Role Type",
-                description="Please choose from: soldier, sniper, defender, scout, heavy_gunner, commander",
-                color=discord.Color.red()
-            )
-        else:
-            role_data = ROLE_TYPES[role]
-            embed = discord.Embed(
-                title=f"HOUND Role: {role_data['title']}",
-                description=role_data['description'],
-                color=discord.Color.blue()
-            )
-            
-        await interaction.response.send_message(embed=embed)
+        await self._send_static(interaction, "hound_role", role)
 
     @app_commands.command(
         name="equipment",
@@ -280,29 +616,7 @@ class ChromehoundsInfo(Plugin):
         category: str
     ):
         """Get information about HOUND equipment and parts."""
-        category = category.lower()
-        
-        if category not in EQUIPMENT_DATA:
-            embed = discord.Embed(
-                title="Invalid Equipment Category",
-                description="Please choose from: weapons, mobility, support",
-                color=discord.Color.red()
-            )
-        else:
-            embed = discord.Embed(
-                title=f"HOUND Equipment: {category.title()}",
-                color=discord.Color.blue()
-            )
-            
-            data = EQUIPMENT_DATA[category]
-            for subcategory, items in data.items():
-                embed.add_field(
-                    name=subcategory.replace('_', ' ').title(),
-                    value="\n".join(f"• {item}" for item in items),
-                    inline=False
-                )
-                
-        await interaction.response.send_message(embed=embed)
+        await self._send_static(interaction, "equipment", category)
 
     @app_commands.command(
         name="mechanics",
@@ -317,23 +631,7 @@ class ChromehoundsInfo(Plugin):
         aspect: str
     ):
         """Get information about specific game mechanics."""
-        aspect = aspect.lower()
-        
-        if aspect not in MECHANICS_DATA:
-            embed = discord.Embed(
-                title="Invalid Mechanic Aspect",
-                description="Please choose from: combat, customization, damage",
-                color=discord.Color.red()
-            )
-        else:
-            mechanic_data = MECHANICS_DATA[aspect]
-            embed = discord.Embed(
-                title=mechanic_data['title'],
-                description=mechanic_data['content'],
-                color=discord.Color.blue()
-            )
-            
-        await interaction.response.send_message(embed=embed)
+        await self._send_static(interaction, "mechanics", aspect)
 
     @app_commands.command(
         name="communication",
@@ -348,23 +646,7 @@ class ChromehoundsInfo(Plugin):
         system: str
     ):
         """Get information about communication systems."""
-        system = system.lower()
-        
-        if system not in COMMUNICATION_DATA:
-            embed = discord.Embed(
-                title="Invalid Communication System",
-                description="Please choose from: combas, network_areas, commander_systems",
-                color=discord.Color.red()
-            )
-        else:
-            system_data = COMMUNICATION_DATA[system]
-            embed = discord.Embed(
-                title=system_data['title'],
-                description=system_data['content'],
-                color=discord.Color.blue()
-            )
-            
-        await interaction.response.send_message(embed=embed)
+        await self._send_static(interaction, "communication", system)
 
     @app_commands.command(
         name="online",
@@ -379,28 +661,29 @@ class ChromehoundsInfo(Plugin):
         feature: str
     ):
         """Get information about online features."""
-        feature = feature.lower()
-        
-        if feature not in ONLINE_FEATURES:
-            embed = discord.Embed(
-                title="Invalid Online Feature",
-                description="Please choose from: neroimus_war, squad_mechanics, territory_control",
-                color=discord.Color.red()
-            )
-        else:
-            feature_data = ONLINE_FEATURES[feature]
-            embed = discord.Embed(
-                title=feature_data['title'],
-                description=feature_data['content'],
-                color=discord.Color.blue()
-            )
-            
-        await interaction.response.send_message(embed=embed)
+        await self._send_static(interaction, "online", feature)
 
     async def cleanup(self):
         """Clean up the plugin before unloading."""
         try:
             self.logger.info("Cleaning up Chromehounds Information plugin...")
+            if self.data_reloader is not None:
+                await self.data_reloader.stop()
+                self.data_reloader = None
+            self.executor.shutdown()
+            if self.metrics_server is not None:
+                await self.metrics_server.stop()
+                self.metrics_server = None
+            self.logger.info(f"Search cache stats: {self.search_cache.stats()}")
+            self.logger.info(f"Query coalescing stats: {self.coalescer.stats()}")
+            if self.query_log is not None:
+                self.query_log.flush()
+                self.logger.info(f"Captured {self.query_log.records} queries to {self.query_log.path}")
+            if METRICS_DUMP_PATH:
+                self.metrics.dump(METRICS_DUMP_PATH, extra={
+                    "search_cache": self.search_cache.stats(),
+                    "coalescing": self.coalescer.stats()
+                })
             if self.chromehounds_group is not None:
                 self.bot.tree.remove_command("chromehounds")
                 for command in self.chromehounds_group.commands:
@@ -409,4 +692,7 @@ class ChromehoundsInfo(Plugin):
             return True
         except Exception as e:
             self.logger.error(f"Error during plugin cleanup: {str(e)}")
-            return False 
\ No newline at end of file
+            return False 
+
+# Time spent importing this module, reported separately from the first use of the game data
+IMPORT_TIME = time.perf_counter() - _import_started
@@ -0,0 +1,62 @@
+"""
+Lazy access to the Chromehounds game data.
+Defers importing the data module (and building its search index) until a command first needs it,
+so loading the plugin stays cheap.
+"""
+import importlib
+import time
+from types import ModuleType
+from typing import Dict, Optional, Tuple
+
+from .documents import Document
+
+
+class LazyCorpus:
+    """
+    Proxy for the data module that imports it on first attribute access.
+
+    Records how long the first load and each category's first access took, so the
+    plugin can report them separately from its own import time.
+    """
+
+    def __init__(self, module_name: str = ".data", package: Optional[str] = __package__):
+        self._module_name = module_name
+        self._package = package
+        self._module: Optional[ModuleType] = None
+        self._materialized: Dict[str, Tuple[Document, ...]] = {}
+        self.timings: Dict[str, float] = {}
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the data module has been imported yet."""
+        return self._module is not None
+
+    @property
+    def module(self) -> ModuleType:
+        """The data module, imported on first use."""
+        if self._module is None:
+            started = time.perf_counter()
+            self._module = importlib.import_module(self._module_name, self._package)
+            self.timings["load"] = time.perf_counter() - started
+        return self._module
+
+    def category(self, name: str) -> Tuple[Document, ...]:
+        """Return a search space category's documents, recording the cost of its first access."""
+        documents = self._materialized.get(name)
+        if documents is None:
+            started = time.perf_counter()
+            documents = tuple(self.module.get_search_index().iter_category(name))
+            self._materialized[name] = documents
+            self.timings[f"category:{name}"] = time.perf_counter() - started
+        return documents
+
+    def invalidate(self):
+        """Forget materialized categories after the data module's contents were replaced."""
+        self._materialized = {}
+
+    def __getattr__(self, name: str):
+        return getattr(self.module, name)
+
+
+# Shared lazy handle on the plugin's data module
+corpus = LazyCorpus()
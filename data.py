@@ -2,6 +2,10 @@
 Chromehounds game data and information.
 This module contains comprehensive information about the Chromehounds game.
 """
+import os
+
+from .query import parse_query
+from .search import SearchIndex
 
 # Game Lore and Background
 LORE_DATA = {
@@ -1022,70 +1026,160 @@ LEGACY_DATA = {
     }
 }
 
+# Searchable data structures
+SEARCH_SPACES = {
+    "lore": LORE_DATA,
+    "roles": ROLE_TYPES,
+    "equipment": EQUIPMENT_DATA,
+    "combat": COMBAT_SYSTEMS,
+    "nations": NATIONS_DATA,
+    "organizations": ORGANIZATIONS_DATA,
+    "history": HISTORICAL_DATA,
+    "communication": COMMUNICATION_DATA,
+    "online": ONLINE_FEATURES,
+    "technical": TECHNICAL_DATA,
+    "legacy": LEGACY_DATA,
+    "mechanics": MECHANICS_DATA,
+    "development": DEVELOPMENT_DATA
+}
+
+# Search space categories behind each category command
+CATEGORY_SCOPES = {
+    "lore": ("lore", "nations", "organizations", "history", "development"),
+    "mechanics": ("mechanics", "combat", "communication"),
+    "parts": ("equipment", "roles"),
+    "strategy": ("roles", "combat")
+}
+
+# `name:` filters accepted in queries: every search space, plus the category command scopes
+QUERY_FILTERS = {
+    **CATEGORY_SCOPES,
+    **{category: (category,) for category in SEARCH_SPACES}
+}
+
+# Path of an SQLite database to serve searches from instead of the in-memory index
+SEARCH_DB_PATH = os.environ.get("CHROMEHOUNDS_SEARCH_DB")
+
+# Path of the in-memory index snapshot reused across restarts (unset for the default, empty to disable)
+SNAPSHOT_PATH = os.environ.get("CHROMEHOUNDS_INDEX_SNAPSHOT")
+
+_search_index = None
+_query_expander = None
+
+def get_search_index():
+    """
+    Returns the search index over SEARCH_SPACES, building it on first use.
+    """
+    if _search_index is None:
+        return rebuild_search_index()
+    return _search_index
+
+def build_search_index(search_spaces: dict, version: int = 0, previous=None):
+    """
+    Builds a search index for the given search spaces without installing it.
+    Uses the SQLite backend when SEARCH_DB_PATH is set, otherwise the in-memory SearchIndex,
+    loaded from the snapshot at SNAPSHOT_PATH when it was built from the same corpus and
+    otherwise reusing the unchanged category segments of `previous`.
+    """
+    # Storage backends are only imported when an index is actually built
+    if SEARCH_DB_PATH:
+        from .storage import SQLiteSearchIndex
+        return SQLiteSearchIndex.build(SEARCH_DB_PATH, search_spaces, version=version)
+
+    from .snapshot import DEFAULT_SNAPSHOT_PATH, corpus_hash, load_snapshot, save_snapshot
+    snapshot_path = DEFAULT_SNAPSHOT_PATH if SNAPSHOT_PATH is None else SNAPSHOT_PATH
+    content_hash = corpus_hash(search_spaces)
+    index = load_snapshot(content_hash, snapshot_path) if snapshot_path else None
+    if index is None:
+        index = SearchIndex(search_spaces, previous=previous if isinstance(previous, SearchIndex) else None)
+        if snapshot_path:
+            try:
+                save_snapshot(index, content_hash, snapshot_path)
+            except OSError:
+                pass  # Read-only plugin directory; keep using the in-memory index
+    index.version = version
+    return index
+
+def rebuild_search_index():
+    """
+    Rebuilds the search index from SEARCH_SPACES under a new version, e.g. after the data has changed.
+    """
+    global _search_index
+    version = _search_index.version + 1 if _search_index is not None else 0
+    _search_index = build_search_index(SEARCH_SPACES, version, previous=_search_index)
+    return _search_index
+
+def install_corpus(module, index):
+    """
+    Switches to reloaded game data and the search index prebuilt for it.
+    
+    Args:
+        module: Freshly executed copy of this module holding the new data
+        index: Search index built from the new module's SEARCH_SPACES with a newer version
+        
+    Returns:
+        The search index that was replaced, for the caller to close once searches on it are done
+    """
+    global _search_index, _query_expander
+    for name, value in vars(module).items():
+        if name.isupper():
+            globals()[name] = value
+    # A single reference swap: searches see either the old index or the new one
+    previous, _search_index = _search_index, index
+    _query_expander = None
+    return previous
+
 # Search function to find relevant information
-def search_chromehounds_data(query: str) -> list:
+def search_chromehounds_data(query: str, index=None) -> list:
     """
     Search through the Chromehounds data based on keywords.
     Returns relevant information matching the search query.
     
+    Supports "quoted phrases", -excluded words and filters such as nations: or equipment:.
+    
     Args:
         query (str): Search query string
+        index: Search index to use, e.g. the one a cached result will be tagged with (default: the current one)
         
     Returns:
-        list: List of dictionaries containing matching information
+        list: Matching documents ordered by relevance
     """
-    query = query.lower()
-    results = []
+    if index is None:
+        index = get_search_index()
+    parsed = parse_query(query, QUERY_FILTERS)
+    expander = get_query_expander()
     
-    # Define searchable data structures
-    search_spaces = {
-        "lore": LORE_DATA,
-        "roles": ROLE_TYPES,
-        "equipment": EQUIPMENT_DATA,
-        "combat": COMBAT_SYSTEMS,
-        "nations": NATIONS_DATA,
-        "organizations": ORGANIZATIONS_DATA,
-        "history": HISTORICAL_DATA,
-        "communication": COMMUNICATION_DATA,
-        "online": ONLINE_FEATURES,
-        "technical": TECHNICAL_DATA,
-        "legacy": LEGACY_DATA,
-        "mechanics": MECHANICS_DATA
-    }
-    
-    # Search through each data structure
-    for category, data in search_spaces.items():
-        # Search through top-level entries
-        for key, value in data.items():
-            if isinstance(value, dict):
-                # Check if query matches in title or content
-                if 'title' in value and query in value['title'].lower():
-                    results.append(value)
-                elif 'content' in value and query in value['content'].lower():
-                    results.append(value)
-                elif 'description' in value and query in value['description'].lower():
-                    results.append(value)
-                
-                # Search through nested dictionaries
-                for subkey, subvalue in value.items():
-                    if isinstance(subvalue, (list, str)):
-                        # Convert to string for searching
-                        content = str(subvalue).lower()
-                        if query in content and value not in results:
-                            results.append(value)
+    # Synonyms are alternatives to the words they replace; related quick references only count when nothing matches
+    return index.search(
+        parsed,
+        limit=5,
+        expansions=expander.expand(query),
+        synonyms=expander.synonyms(parsed.terms)
+    )[:5]  # Return top 5 most relevant results
+
+def search_category_data(topic: str, categories, limit: int = 5, index=None) -> list:
+    """
+    Search a topic within some of the search space categories.
     
-    # If no exact matches found, try matching keywords
-    if not results:
-        for keywords in QUICK_REFERENCES.values():
-            if any(keyword.lower() in query for keyword in keywords):
-                # Add relevant top-level entries
-                for category, data in search_spaces.items():
-                    for key, value in data.items():
-                        if isinstance(value, dict) and 'title' in value:
-                            results.append(value)
-                break
+    Args:
+        topic (str): Topic to look up
+        categories: Names of the SEARCH_SPACES categories to search
+        limit (int): Maximum number of results
+        index: Search index to use (default: the current one)
+        
+    Returns:
+        list: Matching documents ordered by relevance
+    """
+    if index is None:
+        index = get_search_index()
+    results = index.search(parse_query(topic, QUERY_FILTERS), limit=limit, categories=categories)
     
-    return results[:5]  # Return top 5 most relevant results
+    # A topic picked from autocomplete names its entry exactly, so that entry comes first
+    exact = index.find_title(topic, categories)
+    if exact:
+        exact_ids = {document.id for document in exact}
+        results = exact + [document for document in results if document.id not in exact_ids]
+    return results[:limit]
 
 # Quick reference data for common searches
 QUICK_REFERENCES = {
@@ -1098,6 +1192,46 @@ QUICK_REFERENCES = {
     "mechanics": ["construction", "combat", "damage", "communication", "role types"]
 }
 
+# Player slang and alternative names, mapped to the terms the game data uses
+SYNONYMS = {
+    "mech": ["hound"],
+    "mechs": ["hound"],
+    "robot": ["hound"],
+    "treads": ["caterpillar"],
+    "tracks": ["caterpillar"],
+    "tank treads": ["caterpillar"],
+    "hovercraft": ["hover"],
+    "wheels": ["wheeled"],
+    "spider": ["multiped"],
+    "quad legs": ["multiped"],
+    "chicken legs": ["reverse jointed"],
+    "bird legs": ["reverse jointed"],
+    "arty": ["artillery"],
+    "mg": ["machine"],
+    "radio": ["communication", "combas"],
+    "comms": ["communication", "combas"],
+    "countries": ["nations"],
+    "country": ["nation"],
+    "clan": ["squad"],
+    "clans": ["squad"],
+    "multiplayer": ["online", "neroimus war"],
+    "pvp": ["neroimus war"],
+    "campaign": ["single player"],
+    "merc": ["mercenary"],
+    "mercs": ["mercenary"],
+    "armour": ["armor"]
+}
+
+def get_query_expander():
+    """
+    Returns the query expander compiled from SYNONYMS and QUICK_REFERENCES, compiling it on first use.
+    """
+    global _query_expander
+    if _query_expander is None:
+        from .expansion import QueryExpander
+        _query_expander = QueryExpander(SYNONYMS, QUICK_REFERENCES)
+    return _query_expander
+
 def get_quick_suggestions() -> list:
     """
     Returns a list of common search terms and topics about Chromehounds.
@@ -0,0 +1,135 @@
+"""
+Normalized document model for the Chromehounds data.
+Compiles the category dicts, whose entries differ in shape, into one flat tuple of compact records that every command reads from.
+Nested dicts are flattened into sub-documents of their entry, so every leaf is searchable and hits point at the sub-section.
+"""
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Keys holding an entry's main text; entries use one or the other
+BODY_KEYS = ("content", "description")
+
+# (label, items) pairs for an entry's nested lists and strings
+Sections = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+# Separator between an entry's title and its sub-section labels
+PATH_SEPARATOR = " → "
+
+
+def section_label(key: str) -> str:
+    """Turn a data key such as "tactical_use" into a display label such as "Tactical Use"."""
+    return sys.intern(key.replace("_", " ").title())
+
+
+class Document:
+    """
+    One searchable entry of the game data, or one nested sub-section of an entry.
+
+    Attributes:
+        id: Position of the document in the compiled corpus
+        category: SEARCH_SPACES category the entry belongs to
+        key: The entry's key within its category
+        title: The entry's title, or its key as a label when it has none; sub-sections
+            append their path, e.g. "Chassis Types → Hover"
+        body: The entry's content or description; a sub-section's leaves as "Label: items" lines
+        sections: The entry's other lists and strings as (label, items) pairs
+        parent: Id of the entry a sub-section belongs to, None for entries
+        path: Labels of a sub-section below its entry, empty for entries
+    """
+
+    __slots__ = ("id", "category", "key", "title", "body", "sections", "parent", "path")
+
+    def __init__(self, id: int, category: str, key: str, title: str, body: str, sections: Sections,
+                 parent: Optional[int] = None, path: Tuple[str, ...] = ()):
+        self.id = id
+        self.category = category
+        self.key = key
+        self.title = title
+        self.body = body
+        self.sections = sections
+        self.parent = parent
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"Document({self.id}, {self.category!r}, {self.key!r}" + (f", {self.path!r})" if self.path else ")")
+
+    def __getstate__(self):
+        return (self.id, self.category, self.key, self.title, self.body, self.sections, self.parent, self.path)
+
+    def __setstate__(self, state):
+        document_id, category, key, title, body, sections, parent, path = state
+        self.__init__(document_id, sys.intern(category), sys.intern(key), sys.intern(title), body, sections,
+                      parent, path)
+
+
+def _leaf_sections(value: dict, skip: Tuple[str, ...] = ()) -> Sections:
+    """Return a dict's direct strings and lists, except the `skip` keys, as (label, items) pairs."""
+    sections: List[Tuple[str, Tuple[str, ...]]] = []
+    for subkey, subvalue in value.items():
+        if subkey in skip:
+            continue
+        if isinstance(subvalue, str):
+            sections.append((section_label(subkey), (subvalue,)))
+        elif isinstance(subvalue, list):
+            sections.append((section_label(subkey), tuple(str(item) for item in subvalue)))
+    return tuple(sections)
+
+
+def _compile_subsections(documents: List[Document], entry: Document, value: dict, path: Tuple[str, ...]):
+    """
+    Append a sub-document for every nested dict below `value` that holds strings or lists.
+    `documents` starts with the entry itself, so ids continue from the entry's.
+    """
+    for subkey, subvalue in value.items():
+        if not isinstance(subvalue, dict):
+            continue
+        leaves = _leaf_sections(subvalue)
+        # Dicts that only enumerate variants (e.g. chassis "types") don't add a level to the path
+        nested = sum(isinstance(item, dict) for item in subvalue.values())
+        subpath = path if not leaves and nested > 1 else path + (section_label(subkey),)
+        if leaves:
+            documents.append(Document(
+                entry.id + len(documents),
+                entry.category,
+                entry.key,
+                sys.intern(PATH_SEPARATOR.join((entry.title,) + subpath)),
+                "\n".join(f"{label}: {', '.join(items)}" for label, items in leaves),
+                (),
+                parent=entry.id,
+                path=subpath
+            ))
+        _compile_subsections(documents, entry, subvalue, subpath)
+
+
+def compile_entry(document_id: int, category: str, key: str, value: dict) -> List[Document]:
+    """Normalize one data entry into its Document followed by the sub-documents of its nested dicts."""
+    body = next((value[body_key] for body_key in BODY_KEYS if isinstance(value.get(body_key), str)), "")
+    title = value["title"] if isinstance(value.get("title"), str) else key.replace("_", " ").title()
+    sections = _leaf_sections(value, skip=("title",) + BODY_KEYS)
+    entry = Document(document_id, sys.intern(category), sys.intern(key), sys.intern(title), body, sections)
+
+    # Sub-documents are numbered after their entry
+    documents = [entry]
+    _compile_subsections(documents, entry, value, ())
+    return documents
+
+
+def iter_documents(search_spaces: Dict[str, dict], start: int = 0) -> Iterator[Document]:
+    """Yield the Documents for every dict entry of the search spaces, numbered from `start` in corpus order."""
+    document_id = start
+    for category, data in search_spaces.items():
+        for key, value in data.items():
+            if isinstance(value, dict):
+                documents = compile_entry(document_id, category, key, value)
+                yield from documents
+                document_id += len(documents)
+
+
+def compile_documents(search_spaces: Dict[str, dict]) -> Tuple[Document, ...]:
+    """Compile the search spaces into a flat tuple of Documents indexed by id."""
+    return tuple(iter_documents(search_spaces))
+
+
+def get_topics(documents: Iterable[Document]) -> List[str]:
+    """Return the sorted, distinct titles of the entries among the documents."""
+    return sorted({document.title for document in documents if document.parent is None})
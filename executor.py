@@ -0,0 +1,116 @@
+"""
+Query execution for the Chromehounds plugin.
+Runs expensive searches and rendering in a bounded thread pool so they can't stall the event loop,
+and coalesces identical concurrent requests.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+# Executor modes: run everything on the event loop, or offload expensive queries to threads
+MODES = ("inline", "thread")
+
+
+class QueryQueueFull(Exception):
+    """Raised when too many offloaded queries are already running or waiting."""
+
+
+class QueryExecutor:
+    """
+    Runs query work inline when it is cheap and in a bounded thread pool when it is not.
+
+    At most `max_workers` offloaded queries run at once and at most `max_queue` more may wait;
+    beyond that `run` raises QueryQueueFull instead of letting work pile up.
+    """
+
+    def __init__(self, mode: str = "thread", max_workers: int = 2, max_queue: int = 32, cost_threshold: float = 20000):
+        if mode not in MODES:
+            raise ValueError(f"Unknown executor mode: {mode}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.cost_threshold = cost_threshold
+        self.pending = 0
+        self.offloaded = 0
+        self.rejected = 0
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="chromehounds-query")
+        return self._pool
+
+    async def run(self, func: Callable[..., Any], *args: Any, cost: float = 0) -> Any:
+        """
+        Run `func(*args)`, in the thread pool if its estimated cost reaches the threshold.
+
+        Raises:
+            QueryQueueFull: If the pool and its queue are already full
+        """
+        if self.mode == "inline" or cost < self.cost_threshold:
+            return func(*args)
+
+        if self.pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise QueryQueueFull(f"{self.pending} queries already queued")
+
+        self.pending += 1
+        self.offloaded += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), functools.partial(func, *args))
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        """Stop the thread pool without waiting for queued work."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical requests so they share one computation.
+
+    The first caller for a key starts the work; callers arriving while it is in flight
+    await the same result instead of computing it again.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.saved = 0
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the result of `factory()`, sharing it with concurrent callers using the same key.
+
+        The shared work runs as its own task, so one caller being cancelled doesn't cancel it for the others.
+        """
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._finish, key))
+        else:
+            self.saved += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many requests were made and how many computations coalescing saved."""
+        return {
+            "calls": self.calls,
+            "computations": self.calls - self.saved,
+            "saved": self.saved,
+            "in_flight": len(self._inflight)
+        }
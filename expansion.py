@@ -0,0 +1,137 @@
+"""
+Query expansion for the Chromehounds search.
+Compiles synonyms and the quick reference keyword groups into one Aho-Corasick automaton,
+so a single pass over the query finds every phrase to expand into weighted index terms.
+"""
+from typing import Dict, Iterator, List, Mapping, Sequence, Tuple
+
+from .query import Synonym, normalize_query, tokenize
+
+# Weight of a synonym's terms relative to the query's own terms
+SYNONYM_WEIGHT = 0.8
+
+# Weight of the terms related to a quick reference keyword through its group
+REFERENCE_WEIGHT = 0.25
+
+
+class AhoCorasick:
+    """
+    Multi-pattern string matcher: finds every occurrence of any pattern in one pass over the text.
+
+    Patterns are inserted into a character trie whose failure links point at the longest proper
+    suffix that is also a trie path, so matching never backtracks.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            self._output[state] += (pattern_id,)
+
+        # Breadth-first, so every state's failure target is finished before its children need it
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] += self._output[self._fail[child]]
+
+    def find(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (end offset, pattern id) for every pattern occurrence in the text, overlaps included."""
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for pattern_id in self._output[state]:
+                yield position + 1, pattern_id
+
+
+class QueryExpander:
+    """
+    Expands a query with weighted terms from synonyms and quick reference keyword groups.
+
+    A synonym such as "treads" adds its targets ("caterpillar") at SYNONYM_WEIGHT. A quick reference
+    keyword such as "legs" adds its group's name and other keywords at REFERENCE_WEIGHT.
+    Phrases only match whole words.
+    """
+
+    def __init__(self, synonyms: Mapping[str, Sequence[str]], references: Mapping[str, Sequence[str]]):
+        expansions: Dict[str, Dict[str, float]] = {}
+        targets: Dict[str, List[Tuple[str, ...]]] = {}
+
+        def add(phrase: str, terms: Sequence[str], weight: float):
+            targets = expansions.setdefault(normalize_query(phrase), {})
+            for term in terms:
+                for token in tokenize(term):
+                    targets[token] = max(targets.get(token, 0.0), weight)
+
+        for phrase, synonym_targets in synonyms.items():
+            add(phrase, synonym_targets, SYNONYM_WEIGHT)
+            targets.setdefault(normalize_query(phrase), []).extend(
+                tuple(tokenize(target)) for target in synonym_targets if tokenize(target)
+            )
+        for group, keywords in references.items():
+            for keyword in keywords:
+                add(keyword, [group] + [other for other in keywords if other != keyword], REFERENCE_WEIGHT)
+
+        phrases = [phrase for phrase in expansions if phrase]
+        self._expansions = [expansions[phrase] for phrase in phrases]
+        self._targets = [targets.get(phrase, []) for phrase in phrases]
+        # Pad with spaces so patterns can only match on word boundaries
+        self._matcher = AhoCorasick([f" {phrase} " for phrase in phrases])
+
+    def expand(self, query: str) -> List[Tuple[str, float]]:
+        """
+        Return the weighted expansion terms for a query, not including the query's own terms.
+
+        Returns:
+            list: (term, weight) pairs, highest weight first
+        """
+        own = set(tokenize(query))
+        weights: Dict[str, float] = {}
+        for _, pattern_id in self._matcher.find(f" {normalize_query(query)} "):
+            for term, weight in self._expansions[pattern_id].items():
+                if term not in own and weight > weights.get(term, 0.0):
+                    weights[term] = weight
+        return sorted(weights.items(), key=lambda item: (-item[1], item[0]))
+
+    def synonyms(self, terms: Sequence[str]) -> List[Synonym]:
+        """
+        Find the synonyms of runs of a parsed query's terms.
+
+        Returns:
+            list: (start, end, tokens, weight) for every synonym of the phrase terms[start:end]
+        """
+        # Offset of each term's first character in the padded text below
+        starts: Dict[int, int] = {}
+        offset = 1
+        for position, term in enumerate(terms):
+            starts[offset] = position
+            offset += len(term) + 1
+
+        found: List[Synonym] = []
+        for end, pattern_id in self._matcher.find(f" {' '.join(terms)} "):
+            pattern = self._matcher.patterns[pattern_id]
+            start = starts[end - len(pattern) + 1]
+            found.extend(
+                (start, start + pattern.count(" ") - 1, tokens, SYNONYM_WEIGHT) for tokens in self._targets[pattern_id]
+            )
+        return found
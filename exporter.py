@@ -0,0 +1,84 @@
+"""
+Prometheus metrics endpoint for the Chromehounds plugin.
+Serves the plugin's metrics in the Prometheus text format over a small local aiohttp server.
+"""
+import logging
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from .metrics import LatencyHistogram
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Sample = Tuple[Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def format_metric(name: str, kind: str, help_text: str, samples: Iterable[Sample]) -> List[str]:
+    """Format a counter or gauge family as Prometheus text lines."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines.extend(f"{name}{_labels(labels)} {_number(value)}" for labels, value in samples)
+    return lines
+
+
+def format_histograms(name: str, help_text: str, histograms: Iterable[Tuple[Dict[str, str], LatencyHistogram]]) -> List[str]:
+    """Format latency histograms as a Prometheus histogram family with cumulative buckets."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, histogram in histograms:
+        cumulative = 0
+        for bound, count in zip(list(histogram.buckets) + [float("inf")], histogram.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels({**labels, 'le': _number(bound)})} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.total)}")
+        lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+    return lines
+
+
+class MetricsServer:
+    """Local HTTP server exposing `/metrics`; aiohttp is only imported when it starts."""
+
+    def __init__(self, collect: Callable[[], str], host: str = "127.0.0.1", port: int = 9464):
+        self.collect = collect
+        self.host = host
+        self.port = port
+        self.logger = logging.getLogger("plugins.chromehounds_info.exporter")
+        self._runner = None
+
+    async def start(self):
+        """Start serving metrics."""
+        from aiohttp import web
+
+        async def handle_metrics(request: "web.Request") -> "web.Response":
+            return web.Response(body=self.collect().encode(), headers={"Content-Type": CONTENT_TYPE})
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle_metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        try:
+            await site.start()
+        except BaseException:
+            await self.stop()
+            raise
+        self.logger.info(f"Serving Prometheus metrics on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        """Stop serving metrics."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
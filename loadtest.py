@@ -0,0 +1,304 @@
+"""
+Offline load test for the Chromehounds plugin.
+Drives the plugin's command callbacks and autocomplete handlers with stand-in Discord interactions
+from thousands of concurrent tasks, and reports throughput, tail latency and event-loop lag.
+
+Run with `python -m plugins.Chromehounds.loadtest --requests 20000 --concurrency 2000`.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .bench import QUERY_SETS, percentile
+from .chromehounds import CATEGORY_COMMANDS, ChromehoundsInfo
+
+# Relative frequency of each kind of interaction in the generated traffic
+DEFAULT_MIX = {
+    "search": 0.45,
+    "category": 0.2,
+    "autocomplete": 0.25,
+    "static": 0.1
+}
+
+STATIC_COMMANDS = ("hound_role", "equipment", "mechanics", "communication", "online")
+
+# How often the event-loop lag monitor wakes up, in seconds
+LAG_INTERVAL = 0.01
+
+
+class FakeUser:
+    def __init__(self, user_id: int):
+        self.id = user_id
+
+
+class FakeResponse:
+    """Stand-in for `Interaction.response` that records when the interaction was acknowledged."""
+
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _acknowledge(self):
+        if self._done:
+            raise RuntimeError("This interaction has already been responded to before")
+        self._done = True
+        self._interaction.acknowledged = time.perf_counter()
+        await self._interaction.network_delay()
+
+    async def defer(self, *, ephemeral: bool = False, thinking: bool = False):
+        await self._acknowledge()
+
+    async def send_message(self, content: Optional[str] = None, *, embed=None, embeds=None,
+                           ephemeral: bool = False, **kwargs):
+        await self._acknowledge()
+        self._interaction.record(content, embed, embeds)
+
+
+class FakeWebhook:
+    """Stand-in for `Interaction.followup`."""
+
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+
+    async def send(self, content: Optional[str] = None, *, embed=None, embeds=None,
+                   ephemeral: bool = False, **kwargs):
+        if not self._interaction.response.is_done():
+            raise RuntimeError("Followup sent before the interaction was acknowledged")
+        await self._interaction.network_delay()
+        self._interaction.record(content, embed, embeds)
+
+
+class FakeInteraction:
+    """
+    Stand-in for `discord.Interaction` with the parts the plugin uses.
+
+    Every response sleeps for `latency` seconds to simulate the round trip to Discord.
+    """
+
+    def __init__(self, user_id: int = 0, latency: float = 0.0):
+        self.user = FakeUser(user_id)
+        self.response = FakeResponse(self)
+        self.followup = FakeWebhook(self)
+        self.latency = latency
+        self.created = time.perf_counter()
+        self.acknowledged: Optional[float] = None
+        self.messages: List[Dict[str, Any]] = []
+
+    async def network_delay(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def record(self, content: Optional[str], embed, embeds):
+        self.messages.append({"content": content, "embeds": list(embeds or []) + ([embed] if embed is not None else [])})
+
+
+class FakeCommandTree:
+    def __init__(self):
+        self.commands: Dict[str, Any] = {}
+
+    def add_command(self, command, **kwargs):
+        self.commands[command.name] = command
+
+    def remove_command(self, name: str, **kwargs):
+        return self.commands.pop(name, None)
+
+
+class FakeBot:
+    """Minimal bot exposing the command tree the plugin registers with."""
+
+    def __init__(self):
+        self.tree = FakeCommandTree()
+
+
+class LoadTest:
+    """
+    Generates a random mix of interactions against one plugin instance.
+
+    Args:
+        plugin: A set-up ChromehoundsInfo instance
+        mix: Relative frequency of search, category, autocomplete and static interactions
+        users: Number of distinct simulated users (autocomplete sessions are per user)
+        latency: Simulated Discord round-trip time per response, in seconds
+        seed: Seed for the traffic generator
+    """
+
+    def __init__(self, plugin: ChromehoundsInfo, mix: Optional[Dict[str, float]] = None,
+                 users: int = 500, latency: float = 0.0, seed: int = 0):
+        self.plugin = plugin
+        self.mix = dict(mix or DEFAULT_MIX)
+        self.users = users
+        self.latency = latency
+        self.rng = random.Random(seed)
+        self.commands = {command.name: command for command in plugin.chromehounds_group.commands}
+        self.queries = [query for queries in QUERY_SETS.values() for query in queries]
+        self.static_keys = {command: list(plugin.static_embeds[command]) + ["unknown"] for command in STATIC_COMMANDS}
+        self.topics = {category: plugin._topic_index(category).topics for category in CATEGORY_COMMANDS}
+        self.latencies: Dict[str, List[float]] = {kind: [] for kind in self.mix}
+        self.ack_latencies: List[float] = []
+        self.errors: Dict[str, int] = {kind: 0 for kind in self.mix}
+
+    def _interaction(self) -> FakeInteraction:
+        return FakeInteraction(self.rng.randrange(self.users), self.latency)
+
+    def next_request(self) -> Tuple[str, Callable[[], Awaitable[Any]]]:
+        """Pick the next interaction and return its kind and a coroutine factory that performs it."""
+        kind = self.rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        interaction = self._interaction()
+
+        if kind == "search":
+            query = self.rng.choice(self.queries)
+            return kind, lambda: self._command(interaction, self.commands["search"].callback(interaction, query))
+        if kind == "category":
+            category = self.rng.choice(CATEGORY_COMMANDS)
+            topic = self.rng.choice(self.topics[category] + [None])
+            return kind, lambda: self._command(interaction, self.commands[category].callback(interaction, topic))
+        if kind == "autocomplete":
+            category = self.rng.choice(CATEGORY_COMMANDS)
+            typed = self.rng.choice(self.topics[category])[:self.rng.randint(0, 6)]
+            return kind, lambda: self._autocomplete(interaction, category, typed)
+
+        command = self.rng.choice(STATIC_COMMANDS)
+        key = self.rng.choice(self.static_keys[command])
+        callback = getattr(type(self.plugin), command).callback
+        return kind, lambda: self._command(interaction, callback(self.plugin, interaction, key))
+
+    async def _command(self, interaction: FakeInteraction, invocation: Awaitable[Any]):
+        await invocation
+        if interaction.acknowledged is not None:
+            self.ack_latencies.append(interaction.acknowledged - interaction.created)
+        if not interaction.messages:
+            raise RuntimeError("Command finished without sending a message")
+
+    async def _autocomplete(self, interaction: FakeInteraction, category: str, typed: str):
+        # Replay the keystrokes of one user typing the topic, as Discord would
+        for length in range(len(typed) + 1):
+            self.plugin._autocomplete_topics(interaction, category, typed[:length])
+            await asyncio.sleep(0)
+
+    async def _worker(self, remaining: List[int]):
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            kind, perform = self.next_request()
+            started = time.perf_counter()
+            try:
+                await perform()
+            except Exception:
+                self.errors[kind] += 1
+            self.latencies[kind].append(time.perf_counter() - started)
+
+    async def run(self, requests: int, concurrency: int) -> Dict[str, Any]:
+        """Issue `requests` interactions from `concurrency` concurrent tasks and summarize the results."""
+        lags: List[float] = []
+        monitor = asyncio.get_running_loop().create_task(_monitor_lag(lags))
+        remaining = [requests]
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(self._worker(remaining) for _ in range(concurrency)))
+        finally:
+            elapsed = time.perf_counter() - started
+            monitor.cancel()
+            try:
+                await monitor
+            except asyncio.CancelledError:
+                pass
+
+        all_latencies = [latency for latencies in self.latencies.values() for latency in latencies]
+        return {
+            "requests": requests,
+            "concurrency": concurrency,
+            "elapsed": elapsed,
+            "throughput": requests / elapsed if elapsed else 0.0,
+            "errors": dict(self.errors),
+            "latency": {
+                "all": _summarize(all_latencies),
+                **{kind: _summarize(latencies) for kind, latencies in self.latencies.items()}
+            },
+            "ack": _summarize(self.ack_latencies),
+            "loop_lag": _summarize(lags)
+        }
+
+
+async def _monitor_lag(lags: List[float]):
+    """Record how late the event loop wakes a task that sleeps for LAG_INTERVAL."""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + LAG_INTERVAL
+        await asyncio.sleep(LAG_INTERVAL)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "mean": sum(samples) / len(samples) if samples else 0.0,
+        "p50": percentile(samples, 0.50),
+        "p95": percentile(samples, 0.95),
+        "p99": percentile(samples, 0.99),
+        "max": samples[-1] if samples else 0.0
+    }
+
+
+async def run_load_test(requests: int = 10000, concurrency: int = 1000, users: int = 500,
+                        latency: float = 0.0, seed: int = 0, mix: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Set up a plugin against a fake bot, run one load test, and clean the plugin up again.
+
+    Returns:
+        dict: Throughput, per-kind latency percentiles, acknowledgement latency, event-loop lag,
+        and the plugin's own per-stage metrics
+    """
+    plugin = ChromehoundsInfo(FakeBot())
+    if not await plugin.setup():
+        raise RuntimeError("Plugin setup failed")
+    try:
+        results = await LoadTest(plugin, mix, users, latency, seed).run(requests, concurrency)
+        results["plugin"] = {
+            "latency": plugin.metrics.snapshot(),
+            "search_cache": plugin.search_cache.stats(),
+            "coalescing": plugin.coalescer.stats()
+        }
+        return results
+    finally:
+        await plugin.cleanup()
+
+
+def _format_summary(name: str, summary: Dict[str, float]) -> str:
+    return (
+        f"{name}: n={summary['count']} p50 {summary['p50'] * 1000:.2f}ms "
+        f"p95 {summary['p95'] * 1000:.2f}ms p99 {summary['p99'] * 1000:.2f}ms max {summary['max'] * 1000:.2f}ms"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the Chromehounds plugin with simulated interactions.")
+    parser.add_argument("--requests", type=int, default=10000, help="total interactions to issue")
+    parser.add_argument("--concurrency", type=int, default=1000, help="concurrent tasks issuing interactions")
+    parser.add_argument("--users", type=int, default=500, help="distinct simulated users")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated Discord round trip per response, in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="traffic generator seed")
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run_load_test(args.requests, args.concurrency, args.users, args.latency, args.seed))
+    print(f"{results['requests']} interactions in {results['elapsed']:.2f}s ({results['throughput']:.0f}/s), "
+          f"errors: {sum(results['errors'].values())}")
+    for kind, summary in results["latency"].items():
+        print(_format_summary(kind, summary))
+    print(_format_summary("ack", results["ack"]))
+    print(_format_summary("loop lag", results["loop_lag"]))
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
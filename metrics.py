@@ -0,0 +1,129 @@
+"""
+Latency instrumentation for the Chromehounds plugin.
+Records per-command, per-stage timings into fixed-bucket histograms with percentile estimates.
+"""
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Histogram bucket upper bounds in seconds; a final +Inf bucket is implicit
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+class LatencyHistogram:
+    """Cumulative-bucket latency histogram with interpolated percentiles."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        """Record one duration."""
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def copy(self) -> "LatencyHistogram":
+        """Return an independent copy of the histogram."""
+        histogram = LatencyHistogram(self.buckets)
+        histogram.counts = list(self.counts)
+        histogram.count = self.count
+        histogram.total = self.total
+        histogram.max = self.max
+        return histogram
+
+    def percentile(self, fraction: float) -> float:
+        """Estimate a percentile (e.g. 0.95) by interpolating inside the bucket that contains it."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        cumulative = 0
+        for position, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.buckets[position - 1] if position > 0 else 0.0
+                upper = self.buckets[position] if position < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - cumulative) / bucket_count, self.max)
+            cumulative += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Return count, mean, max and p50/p95/p99 in seconds."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99)
+        }
+
+
+class Metrics:
+    """Thread-safe registry of latency histograms keyed by (command, stage), plus named counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.counters: Dict[Tuple[str, str], int] = {}
+
+    def observe(self, command: str, stage: str, seconds: float):
+        """Record how long a stage of a command took."""
+        with self._lock:
+            histogram = self.histograms.get((command, stage))
+            if histogram is None:
+                histogram = self.histograms[(command, stage)] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    def increment(self, command: str, name: str, amount: int = 1):
+        """Add to a named counter, e.g. errors for a command."""
+        with self._lock:
+            self.counters[(command, name)] = self.counters.get((command, name), 0) + amount
+
+    @contextmanager
+    def time(self, command: str, stage: str) -> Iterator[None]:
+        """Time the enclosed block as one stage of a command."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(command, stage, time.perf_counter() - started)
+
+    def histogram_items(self) -> List[Tuple[Tuple[str, str], LatencyHistogram]]:
+        """Return a consistent copy of every histogram with its (command, stage) key."""
+        with self._lock:
+            return [(key, histogram.copy()) for key, histogram in sorted(self.histograms.items())]
+
+    def counter_items(self) -> List[Tuple[Tuple[str, str], int]]:
+        """Return every counter with its (command, name) key."""
+        with self._lock:
+            return sorted(self.counters.items())
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Return every histogram summary as {command: {stage: summary}}."""
+        with self._lock:
+            summaries = {key: histogram.summary() for key, histogram in self.histograms.items()}
+        result: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (command, stage), summary in sorted(summaries.items()):
+            result.setdefault(command, {})[stage] = summary
+        return result
+
+    def dump(self, path: str, extra: Optional[dict] = None):
+        """Write the histogram summaries and counters (plus any extra stats) to a JSON file."""
+        with self._lock:
+            counters = {f"{command}.{name}": value for (command, name), value in sorted(self.counters.items())}
+        payload = {"timestamp": time.time(), "latency": self.snapshot(), "counters": counters}
+        if extra:
+            payload.update(extra)
+        with open(path, "w") as output:
+            json.dump(payload, output, indent=2)
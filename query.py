@@ -0,0 +1,150 @@
+"""
+Query parsing for the Chromehounds search.
+Turns query text into terms, quoted phrases, -exclusions and category: filters for the search backends to execute.
+"""
+import re
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# A synonym found among a query's terms: (start, end, tokens, weight), replacing terms[start:end]
+Synonym = Tuple[int, int, Tuple[str, ...], float]
+
+# One query part: an optional "-", an optional "name:" prefix, then a quoted phrase or a bare word
+PART_PATTERN = re.compile(r'(-?)(?:([a-z_]+):)?(?:"([^"]*)"?|([^\s"]+))?')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _parts(text: str) -> Iterator[Tuple[bool, Optional[str], Optional[str], Optional[str]]]:
+    """Yield (negated, field, phrase, word) for each part of the query text."""
+    for match in PART_PATTERN.finditer(text.lower()):
+        negated, field, phrase, word = match.groups()
+        if field is None and phrase is None and word is None:
+            continue
+        yield bool(negated), field, phrase, word
+
+
+def normalize_query(query: str) -> str:
+    """
+    Return the canonical form of a query, used as a cache key.
+
+    Plain words are reduced to their tokens; quotes, exclusions and filters are kept,
+    so queries that parse differently never share a key.
+    """
+    parts = []
+    for negated, field, phrase, word in _parts(query):
+        tokens = tokenize(phrase if phrase is not None else word or "")
+        if phrase is not None or (negated and len(tokens) > 1):
+            text = f'"{" ".join(tokens)}"' if tokens else ""
+        else:
+            text = " ".join(tokens)
+        if field is None and not text:
+            continue
+        parts.append(("-" if negated else "") + (f"{field}:" if field is not None else "") + text)
+    return " ".join(parts)
+
+
+class Query:
+    """
+    A parsed search query.
+
+    Attributes:
+        terms: Tokens every result must contain, matched as prefixes
+        phrases: Token sequences every result must contain in order, matched exactly
+        excluded_terms: Tokens no result may contain, matched as prefixes
+        excluded_phrases: Token sequences no result may contain
+        categories: Categories results must come from, or None for all
+        excluded_categories: Categories results may not come from
+    """
+
+    __slots__ = ("terms", "phrases", "excluded_terms", "excluded_phrases", "categories", "excluded_categories")
+
+    def __init__(self):
+        self.terms: List[str] = []
+        self.phrases: List[Tuple[str, ...]] = []
+        self.excluded_terms: List[str] = []
+        self.excluded_phrases: List[Tuple[str, ...]] = []
+        self.categories: Optional[Set[str]] = None
+        self.excluded_categories: Set[str] = set()
+
+    def __bool__(self) -> bool:
+        return bool(self.terms or self.phrases)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Query):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"Query({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__ if getattr(self, name))})"
+
+
+def _add_word(query: Query, tokens: List[str], negated: bool):
+    """Add a bare word's tokens as terms; an excluded word that splits into several tokens is excluded as a phrase."""
+    if not negated:
+        query.terms.extend(tokens)
+    elif len(tokens) > 1:
+        query.excluded_phrases.append(tuple(tokens))
+    else:
+        query.excluded_terms.extend(tokens)
+
+
+def parse_query(text: str, scopes: Optional[Mapping[str, Sequence[str]]] = None) -> Query:
+    """
+    Parse query text.
+
+    Bare words are required terms, `"quoted words"` are phrases, a leading `-` excludes a word or phrase,
+    and `name:` restricts results to the categories `scopes` maps that name to (`-name:` excludes them).
+    A `name:` the scopes don't know is searched as a word of its own, followed by what comes after it.
+
+    Args:
+        text (str): Query text
+        scopes (Optional[Mapping[str, Sequence[str]]]): Filter names mapped to the categories they select
+
+    Returns:
+        Query: The parsed query
+    """
+    query = Query()
+    for negated, field, phrase, word in _parts(text):
+        if field is not None:
+            scope = scopes.get(field) if scopes else None
+            if scope is None:
+                _add_word(query, tokenize(field), negated)
+            elif negated:
+                query.excluded_categories.update(scope)
+            else:
+                query.categories = (query.categories or set()) | set(scope)
+
+        if phrase is not None:
+            tokens = tuple(tokenize(phrase))
+            if tokens:
+                (query.excluded_phrases if negated else query.phrases).append(tokens)
+        elif word:
+            _add_word(query, tokenize(word), negated)
+    return query
+
+
+def synonym_spans(synonyms: Sequence[Synonym]) -> List[Tuple[int, int, List[Tuple[Tuple[str, ...], float]]]]:
+    """
+    Group synonyms by the span of query terms they replace.
+
+    Longer spans win, so where "chicken legs" and "legs" both have synonyms, the phrase's are used.
+
+    Returns:
+        list: (start, end, alternatives) with non-overlapping spans, alternatives being (tokens, weight) pairs
+    """
+    alternatives: Dict[Tuple[int, int], List[Tuple[Tuple[str, ...], float]]] = {}
+    for start, end, tokens, weight in synonyms:
+        alternatives.setdefault((start, end), []).append((tokens, weight))
+
+    spans = []
+    covered: Set[int] = set()
+    for start, end in sorted(alternatives, key=lambda span: (span[0] - span[1], span[0])):
+        if covered.isdisjoint(range(start, end)):
+            covered.update(range(start, end))
+            spans.append((start, end, alternatives[(start, end)]))
+    return sorted(spans)
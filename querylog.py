@@ -0,0 +1,66 @@
+"""
+Query log capture for the Chromehounds plugin.
+Records normalized queries with their command and timing to a compact append-only log for offline replay.
+"""
+import json
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from .query import normalize_query
+
+# Records buffered in memory before they are appended to the log file
+FLUSH_EVERY = 64
+
+
+class QueryLog:
+    """
+    Append-only log of the queries the plugin served.
+
+    Only the normalized query text, the command name, a timestamp and the duration are kept;
+    nothing identifies the user, guild or channel. Each record is one compact JSON line.
+    """
+
+    def __init__(self, path: str, flush_every: int = FLUSH_EVERY):
+        self.path = path
+        self.flush_every = flush_every
+        self.records = 0
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+
+    def record(self, command: str, query: Optional[str], seconds: float):
+        """Buffer one served query, appending the buffer to the log once it is full."""
+        line = json.dumps({
+            "t": round(time.time(), 3),
+            "c": command,
+            "q": normalize_query(query or ""),
+            "ms": round(seconds * 1000, 3)
+        }, separators=(",", ":"))
+        with self._lock:
+            self._buffer.append(line)
+            self.records += 1
+            if len(self._buffer) >= self.flush_every:
+                self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            with open(self.path, "a", encoding="utf-8") as log:
+                log.write("\n".join(self._buffer) + "\n")
+            self._buffer = []
+
+    def flush(self):
+        """Append any buffered records to the log."""
+        with self._lock:
+            self._flush()
+
+
+def read_log(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the records of a query log in order, skipping lines that can't be parsed."""
+    with open(path, encoding="utf-8") as log:
+        for line in log:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and "c" in record and "t" in record:
+                yield record
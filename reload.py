@@ -0,0 +1,129 @@
+"""
+Hot reload of the Chromehounds game data.
+Watches the data sources and swaps in a rebuilt search index without reloading the plugin.
+"""
+import asyncio
+import importlib.util
+import logging
+import os
+from types import ModuleType
+from typing import Callable, Dict, List, Optional
+
+from .corpus import LazyCorpus
+
+# Seconds between checks of the data sources for changes
+DEFAULT_INTERVAL = 5.0
+
+# Seconds a replaced index stays open for the searches that started on it
+RETIRE_DELAY = 30.0
+
+
+def load_data_module(module: ModuleType) -> ModuleType:
+    """
+    Execute a fresh copy of a data module from its source file.
+
+    The copy is not registered in sys.modules, so the live module and every reference
+    to its data stay untouched until the new data is installed.
+    """
+    spec = importlib.util.spec_from_file_location(module.__name__, module.__file__)
+    fresh = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(fresh)
+    return fresh
+
+
+class DataReloader:
+    """
+    Polls the data sources' modification times and hot-reloads the corpus when they change.
+
+    The new data is loaded and indexed in a worker thread, reusing the index segments of
+    unchanged categories, then installed with a single swap under a new index version.
+    Searches in flight keep using the index they started with; a replaced index that holds a
+    connection is closed RETIRE_DELAY seconds later.
+    """
+
+    def __init__(self, corpus: LazyCorpus, on_reload: Optional[Callable[[int], None]] = None,
+                 interval: float = DEFAULT_INTERVAL, extra_paths: Optional[List[str]] = None):
+        self.corpus = corpus
+        self.on_reload = on_reload
+        self.interval = interval
+        self.extra_paths = list(extra_paths or [])
+        self.reloads = 0
+        self.logger = logging.getLogger("plugins.chromehounds_info.reload")
+        self._mtimes: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def paths(self) -> List[str]:
+        """The files whose changes trigger a reload."""
+        return [self.corpus.module.__file__] + self.extra_paths
+
+    def _snapshot_mtimes(self) -> Dict[str, float]:
+        mtimes = {}
+        for path in self.paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime
+            except OSError:
+                mtimes[path] = 0.0
+        return mtimes
+
+    def start(self):
+        """Start watching in the background."""
+        if self._task is None or self._task.done():
+            self._mtimes = self._snapshot_mtimes()
+            self._task = asyncio.get_running_loop().create_task(self._watch())
+
+    async def stop(self):
+        """Stop watching."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Error reloading Chromehounds data: {str(e)}")
+
+    async def check(self) -> bool:
+        """Reload the data if any watched file changed since the last check."""
+        mtimes = self._snapshot_mtimes()
+        if mtimes == self._mtimes:
+            return False
+        self._mtimes = mtimes
+        await self.reload()
+        return True
+
+    async def reload(self):
+        """Load the data sources again, index them off the event loop, and install the result."""
+        data = self.corpus.module
+        loop = asyncio.get_running_loop()
+
+        def build():
+            fresh = load_data_module(data)
+            current = data.get_search_index()
+            index = data.build_search_index(fresh.SEARCH_SPACES, current.version + 1, previous=current)
+            return fresh, index
+
+        fresh, index = await loop.run_in_executor(None, build)
+        previous = data.install_corpus(fresh, index)
+        self.corpus.invalidate()
+        self.reloads += 1
+        # Backends holding a connection (SQLite) are closed once searches on them are done
+        close = getattr(previous, "close", None)
+        if close is not None and previous is not index:
+            loop.call_later(RETIRE_DELAY, close)
+        rebuilt = getattr(index, "rebuilt_segments", None)
+        self.logger.info(
+            f"Reloaded Chromehounds data as index version {index.version}"
+            + (f" (rebuilt: {', '.join(rebuilt) or 'none'})" if rebuilt is not None else "")
+        )
+        if self.on_reload is not None:
+            self.on_reload(index.version)
@@ -0,0 +1,126 @@
+"""
+Query log replay for the Chromehounds plugin.
+Runs a captured query log against the plugin offline, at the captured pace or faster,
+so caches and ranking can be tuned against real traffic.
+
+Run with `python -m plugins.Chromehounds.replay queries.log --speed 10`.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from .chromehounds import CATEGORY_COMMANDS, ChromehoundsInfo
+from .loadtest import FakeBot, FakeInteraction, _monitor_lag, _summarize
+from .querylog import read_log
+
+
+async def replay(path: str, speed: float = 1.0, concurrency: int = 1000, latency: float = 0.0) -> Dict[str, Any]:
+    """
+    Replay a captured query log against a freshly set-up plugin.
+
+    Args:
+        path: Query log to replay
+        speed: Multiple of the captured pace to replay at; 0 replays as fast as possible
+        concurrency: Maximum replayed interactions in flight at once
+        latency: Simulated Discord round trip per response, in seconds
+
+    Returns:
+        dict: Per-command latency percentiles, event-loop lag, and the plugin's cache and coalescing stats
+    """
+    records = list(read_log(path))
+    plugin = ChromehoundsInfo(FakeBot())
+    if not await plugin.setup():
+        raise RuntimeError("Plugin setup failed")
+    commands = {command.name: command for command in plugin.chromehounds_group.commands}
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    skipped = 0
+    limit = asyncio.Semaphore(concurrency)
+
+    async def perform(command: str, query: str):
+        interaction = FakeInteraction(latency=latency)
+        started = time.perf_counter()
+        try:
+            if command.endswith("_autocomplete"):
+                plugin._autocomplete_topics(interaction, command[:-len("_autocomplete")], query)
+            elif command == "search":
+                await commands["search"].callback(interaction, query)
+            else:
+                await commands[command].callback(interaction, query or None)
+        except Exception:
+            errors[command] = errors.get(command, 0) + 1
+        finally:
+            limit.release()
+        latencies.setdefault(command, []).append(time.perf_counter() - started)
+
+    known = {"search"} | set(CATEGORY_COMMANDS) | {f"{category}_autocomplete" for category in CATEGORY_COMMANDS}
+    lags: List[float] = []
+    loop = asyncio.get_running_loop()
+    monitor = loop.create_task(_monitor_lag(lags))
+    tasks = []
+    started = loop.time()
+    try:
+        first = records[0]["t"] if records else 0.0
+        for record in records:
+            if record["c"] not in known:
+                skipped += 1
+                continue
+            if speed > 0:
+                delay = started + (record["t"] - first) / speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await limit.acquire()
+            tasks.append(loop.create_task(perform(record["c"], record.get("q", ""))))
+        await asyncio.gather(*tasks)
+        elapsed = loop.time() - started
+    finally:
+        monitor.cancel()
+        try:
+            await monitor
+        except asyncio.CancelledError:
+            pass
+        stats = {"search_cache": plugin.search_cache.stats(), "coalescing": plugin.coalescer.stats()}
+        await plugin.cleanup()
+
+    replayed = len(records) - skipped
+    return {
+        "records": len(records),
+        "replayed": replayed,
+        "skipped": skipped,
+        "elapsed": elapsed,
+        "throughput": replayed / elapsed if elapsed else 0.0,
+        "errors": errors,
+        "latency": {command: _summarize(samples) for command, samples in sorted(latencies.items())},
+        "loop_lag": _summarize(lags),
+        **stats
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a captured Chromehounds query log against the plugin.")
+    parser.add_argument("log", help="query log written with CHROMEHOUNDS_QUERY_LOG")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay pace as a multiple of the captured pace (0 = flat out)")
+    parser.add_argument("--concurrency", type=int, default=1000, help="maximum replayed interactions in flight")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated Discord round trip per response, in seconds")
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(replay(args.log, args.speed, args.concurrency, args.latency))
+    print(f"Replayed {results['replayed']} of {results['records']} queries in {results['elapsed']:.2f}s, "
+          f"errors: {sum(results['errors'].values())}")
+    for command, summary in results["latency"].items():
+        print(f"{command}: n={summary['count']} p50 {summary['p50'] * 1000:.2f}ms "
+              f"p95 {summary['p95'] * 1000:.2f}ms p99 {summary['p99'] * 1000:.2f}ms")
+    print(f"Search cache: {results['search_cache']}")
+    print(f"Query coalescing: {results['coalescing']}")
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,508 @@
+"""
+Search index for the Chromehounds data.
+Builds an inverted index over the game data once so searches don't rescan every entry.
+"""
+import hashlib
+import heapq
+import json
+import math
+from bisect import bisect_left
+from typing import Collection, Dict, FrozenSet, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from .documents import Document, iter_documents
+from .query import Query, Synonym, parse_query, synonym_spans, tokenize
+
+
+# Relative weight of each entry field when scoring matches
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "body": 1.5,
+    "nested": 0.5
+}
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Score multiplier for tokens that only match a query term as a prefix
+PREFIX_MATCH_WEIGHT = 0.6
+
+# Score multiplier for tokens that only match a query term within a small edit distance
+FUZZY_MATCH_WEIGHT = 0.4
+
+# Shortest query term that gets typo-tolerant matching
+FUZZY_MIN_LENGTH = 4
+
+def _bm25(idf: float, frequency: float) -> float:
+    """BM25 score of a token with the given (match-weighted) idf and term frequency in an entry."""
+    return idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1)
+
+
+def _intersect(units: Sequence[Dict[int, float]]) -> Dict[int, float]:
+    """Return the entries present in every unit, scored by the sum of their unit scores."""
+    if not units:
+        return {}
+    first, *rest = sorted(units, key=len)
+    return {
+        entry_id: score + sum(unit[entry_id] for unit in rest)
+        for entry_id, score in first.items()
+        if all(entry_id in unit for unit in rest)
+    }
+
+
+def trigrams(token: str) -> Set[str]:
+    """Return the character trigrams of a token, padded so short tokens still have some."""
+    padded = f"${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_edit_distance(term: str) -> int:
+    """Return how many typos to tolerate in a query term of this length."""
+    if len(term) < FUZZY_MIN_LENGTH:
+        return 0
+    return 1 if len(term) < 8 else 2
+
+
+def bounded_edit_distance(source: str, target: str, limit: int) -> Optional[int]:
+    """
+    Levenshtein distance between two strings, abandoned as soon as it must exceed the limit.
+
+    Returns:
+        Optional[int]: The distance, or None if it is greater than the limit
+    """
+    if abs(len(source) - len(target)) > limit:
+        return None
+    previous = list(range(len(target) + 1))
+    for i, source_char in enumerate(source, 1):
+        current = [i] + [0] * len(target)
+        for j, target_char in enumerate(target, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (source_char != target_char)
+            )
+        if min(current) > limit:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+def entry_fields(document: Document) -> Dict[str, List[str]]:
+    """Split a document into tokenized title, body and nested (section) fields."""
+    title = tokenize(document.title)
+    if "_" in document.key:
+        # Let "salkar" find "sal_kar" as well as "sal kar"
+        title.append(document.key.replace("_", "").lower())
+    return {
+        "title": title,
+        "body": tokenize(document.body),
+        "nested": tokenize("\n".join(item for _, items in document.sections for item in items))
+    }
+
+
+def segment_hash(data: dict) -> str:
+    """Hash a category's data, to tell whether its index segment can be reused."""
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class SearchIndex:
+    """
+    Inverted index mapping tokens to the ids of the documents that contain them, ranked with BM25F.
+
+    Each category's tokenized entries form a segment. When a previous index is given, segments
+    whose data hasn't changed are reused instead of re-tokenized; only the corpus-wide statistics
+    and postings are recomputed. An index is never modified after it is built.
+    """
+
+    def __init__(self, search_spaces: Dict[str, dict], field_weights: Optional[Dict[str, float]] = None,
+                 version: int = 0, previous: Optional["SearchIndex"] = None):
+        self.version = version
+        self.field_weights = dict(FIELD_WEIGHTS if field_weights is None else field_weights)
+        self.documents: Tuple[Document, ...] = ()
+        self.segment_hashes: Dict[str, str] = {}
+        self.rebuilt_segments: List[str] = []
+        self._segments: Dict[str, List[Dict[str, List[str]]]] = {}
+        documents: List[Document] = []
+        all_fields = []
+
+        for category, data in search_spaces.items():
+            category_documents = list(iter_documents({category: data}, start=len(documents)))
+            category_hash = segment_hash(data)
+            segment = None
+            if previous is not None and previous.segment_hashes.get(category) == category_hash:
+                segment = previous._segments.get(category)
+            if segment is None:
+                segment = [entry_fields(document) for document in category_documents]
+                self.rebuilt_segments.append(category)
+            self.segment_hashes[category] = category_hash
+            self._segments[category] = segment
+            documents.extend(category_documents)
+            all_fields.extend(segment)
+        self.documents = tuple(documents)
+
+        # Average field lengths for BM25 length normalization
+        average_lengths = {
+            field: (sum(len(fields[field]) for fields in all_fields) / len(all_fields)) or 1.0
+            for field in self.field_weights
+        } if all_fields else {}
+
+        # Field-weighted, length-normalized term frequencies per entry
+        postings: Dict[str, List[Tuple[int, float]]] = {}
+        positions: Dict[str, Dict[int, List[int]]] = {}
+        for entry_id, fields in enumerate(all_fields):
+            # Fields are numbered one apart, so phrases can't match across a field boundary
+            offset = 0
+            for tokens in fields.values():
+                for position, token in enumerate(tokens, offset):
+                    positions.setdefault(token, {}).setdefault(entry_id, []).append(position)
+                offset += len(tokens) + 1
+
+            frequencies: Dict[str, float] = {}
+            for field, weight in self.field_weights.items():
+                tokens = fields.get(field, [])
+                if not tokens or not weight:
+                    continue
+                norm = 1 - BM25_B + BM25_B * len(tokens) / average_lengths[field]
+                for token in tokens:
+                    frequencies[token] = frequencies.get(token, 0.0) + weight / norm
+            for token, frequency in frequencies.items():
+                postings.setdefault(token, []).append((entry_id, frequency))
+
+        entry_count = len(self.documents)
+        self.postings: Dict[str, tuple] = {token: tuple(ids) for token, ids in postings.items()}
+        self.idf: Dict[str, float] = {
+            token: math.log(1 + (entry_count - len(ids) + 0.5) / (len(ids) + 0.5))
+            for token, ids in self.postings.items()
+        }
+        self.vocabulary: List[str] = sorted(self.postings)
+
+        # Token -> entry id -> positions of the token in the entry, for phrase queries
+        self.positions: Dict[str, Dict[int, Tuple[int, ...]]] = {
+            token: {entry_id: tuple(offsets) for entry_id, offsets in entries.items()}
+            for token, entries in positions.items()
+        }
+
+        # Highest term frequency of each token, bounding its score to stop single-term searches early
+        self.max_frequency: Dict[str, float] = {
+            token: max(frequency for _, frequency in ids) for token, ids in self.postings.items()
+        }
+
+        # Category -> ids of its entries, for scoped searches
+        category_ids: Dict[str, Set[int]] = {}
+        for document in self.documents:
+            category_ids.setdefault(document.category, set()).add(document.id)
+        self.category_ids: Dict[str, FrozenSet[int]] = {
+            category: frozenset(ids) for category, ids in category_ids.items()
+        }
+        self._scopes: Dict[FrozenSet[str], FrozenSet[int]] = {}
+
+        # Lowercased title -> ids of the entries with that title, for exact topic lookups
+        titles: Dict[str, List[int]] = {}
+        for document in self.documents:
+            titles.setdefault(document.title.lower(), []).append(document.id)
+        self.titles: Dict[str, Tuple[int, ...]] = {title: tuple(ids) for title, ids in titles.items()}
+
+        # `name:` query filters for query text parsed by the index itself
+        self.filters: Dict[str, Tuple[str, ...]] = {category: (category,) for category in self.category_ids}
+
+        # Character trigram -> ids of the vocabulary tokens containing it, for typo-tolerant lookups
+        trigram_index: Dict[str, List[int]] = {}
+        for token_id, token in enumerate(self.vocabulary):
+            for trigram in trigrams(token):
+                trigram_index.setdefault(trigram, []).append(token_id)
+        self.trigram_index: Dict[str, tuple] = {trigram: tuple(ids) for trigram, ids in trigram_index.items()}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def iter_entries(self) -> Iterator[Document]:
+        """Yield every indexed document in corpus order."""
+        return iter(self.documents)
+
+    def iter_category(self, category: str) -> Iterator[Document]:
+        """Yield the documents of one category in corpus order."""
+        return (self.documents[entry_id] for entry_id in sorted(self.category_ids.get(category, ())))
+
+    def estimate_cost(self, query: str) -> int:
+        """
+        Roughly estimate how much work a query is, in postings scanned, without running it.
+        Each term is charged the postings of every token it prefix-matches; terms with no
+        prefix match are charged the whole vocabulary for typo-tolerant lookup.
+        """
+        cost = 0
+        for term in tokenize(query):
+            scanned = sum(len(self.postings[token]) for token in self._prefix_tokens(term))
+            cost += scanned or len(self.vocabulary)
+        return cost
+
+    def _prefix_tokens(self, term: str) -> List[str]:
+        """Return the vocabulary tokens starting with the term, in sorted order."""
+        start = end = bisect_left(self.vocabulary, term)
+        while end < len(self.vocabulary) and self.vocabulary[end].startswith(term):
+            end += 1
+        return self.vocabulary[start:end]
+
+    def fuzzy_tokens(self, term: str) -> List[Tuple[str, int]]:
+        """
+        Find vocabulary tokens within a bounded edit distance of the term.
+
+        Candidates are generated from shared trigrams, so only tokens that could be within
+        the distance limit are compared character by character.
+
+        Returns:
+            list: (token, distance) pairs
+        """
+        limit = max_edit_distance(term)
+        if not limit:
+            return []
+
+        term_trigrams = trigrams(term)
+        shared: Dict[int, int] = {}
+        for trigram in term_trigrams:
+            for token_id in self.trigram_index.get(trigram, ()):
+                shared[token_id] = shared.get(token_id, 0) + 1
+
+        # Each edit can break at most three trigrams
+        required = max(1, len(term_trigrams) - 3 * limit)
+        matches = []
+        for token_id, count in shared.items():
+            if count < required:
+                continue
+            token = self.vocabulary[token_id]
+            distance = bounded_edit_distance(term, token, limit)
+            if distance is not None:
+                matches.append((token, distance))
+        return matches
+
+    def _score_term(self, term: str) -> Dict[int, float]:
+        """
+        Return the BM25 score of each entry containing a token that starts with the term,
+        falling back to tokens within a small edit distance when nothing does.
+        """
+        scores: Dict[int, float] = {}
+        for token in self._prefix_tokens(term):
+            weight = self.idf[token] * (1.0 if token == term else PREFIX_MATCH_WEIGHT)
+            for entry_id, frequency in self.postings[token]:
+                score = _bm25(weight, frequency)
+                if score > scores.get(entry_id, 0.0):
+                    scores[entry_id] = score
+
+        if not scores:
+            for token, distance in self.fuzzy_tokens(term):
+                weight = self.idf[token] * FUZZY_MATCH_WEIGHT / distance
+                for entry_id, frequency in self.postings[token]:
+                    score = _bm25(weight, frequency)
+                    if score > scores.get(entry_id, 0.0):
+                        scores[entry_id] = score
+        return scores
+
+    def _group(self, entry_id: int) -> int:
+        """Return the id of the entry a document belongs to: its parent's for a sub-section, its own otherwise."""
+        parent = self.documents[entry_id].parent
+        return entry_id if parent is None else parent
+
+    def _top_per_group(self, scores: Dict[int, float], limit: int) -> List[Tuple[float, int]]:
+        """
+        Return the best (score, -id) pairs, best first, keeping only the best of an entry and its sub-sections
+        so one entry can't fill the results with its own sections. Ties keep corpus order.
+        """
+        best: Dict[int, Tuple[float, int]] = {}
+        for entry_id, score in scores.items():
+            item = (score, -entry_id)
+            group = self._group(entry_id)
+            if item > best.get(group, (-math.inf, 0)):
+                best[group] = item
+        return heapq.nlargest(limit, best.values())
+
+    def _top_term(self, term: str, limit: int, allowed: Optional[FrozenSet[int]]) -> List[Tuple[float, int]]:
+        """
+        Return the best (score, -id) pairs for a single term, best first, scoring the same way as _score_term.
+
+        Prefix matches are visited from the highest possible score down, keeping a bounded heap of the
+        top entries, one per group as in _top_per_group; once a token's best possible score can't beat the current k-th best, the rest are skipped.
+        """
+        weighted = []
+        for token in self._prefix_tokens(term):
+            idf = self.idf[token] * (1.0 if token == term else PREFIX_MATCH_WEIGHT)
+            # Computed with the same _bm25 as the entry scores below, so ties aren't lost to rounding
+            weighted.append((_bm25(idf, self.max_frequency[token]), token, idf))
+        weighted.sort(reverse=True)
+        if not weighted:
+            scores = self._score_term(term)
+            if allowed is not None:
+                scores = {entry_id: score for entry_id, score in scores.items() if entry_id in allowed}
+            return self._top_per_group(scores, limit)
+
+        best: Dict[int, Tuple[float, int]] = {}  # Best (score, -id) seen per group
+        heap: List[Tuple[float, int]] = []  # Min-heap of the current top entries as (score, -id), one per group
+        for bound, token, idf in weighted:
+            if len(heap) >= limit and bound < heap[0][0]:
+                break
+            for entry_id, frequency in self.postings[token]:
+                if allowed is not None and entry_id not in allowed:
+                    continue
+                item = (_bm25(idf, frequency), -entry_id)
+                group = self._group(entry_id)
+                previous = best.get(group)
+                if previous is not None and item <= previous:
+                    continue
+                best[group] = item
+                if previous is not None and previous in heap:
+                    # The entry's group is already in the top k: replace its entry in place
+                    heap[heap.index(previous)] = item
+                    heapq.heapify(heap)
+                elif len(heap) < limit:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+        return sorted(heap, reverse=True)
+
+    def find_title(self, title: str, categories: Optional[Collection[str]] = None) -> List[Document]:
+        """Return the entries titled exactly `title` (ignoring case), optionally only from some categories."""
+        ids = self.titles.get(title.strip().lower(), ())
+        allowed = self.scope(categories) if categories is not None else None
+        return [self.documents[entry_id] for entry_id in ids if allowed is None or entry_id in allowed]
+
+    def scope(self, categories: Collection[str]) -> FrozenSet[int]:
+        """Return the ids of the entries in any of the given categories."""
+        key = frozenset(categories)
+        ids = self._scopes.get(key)
+        if ids is None:
+            ids = frozenset().union(*(self.category_ids.get(category, ()) for category in key))
+            self._scopes[key] = ids
+        return ids
+
+    def _exact_score(self, token: str, entry_id: int) -> float:
+        """Return the BM25 score of an entry for a token it contains."""
+        ids = self.postings[token]
+        frequency = ids[bisect_left(ids, (entry_id,))][1]
+        return _bm25(self.idf[token], frequency)
+
+    def _score_phrase(self, tokens: Sequence[str]) -> Dict[int, float]:
+        """
+        Return the score of each entry containing the tokens consecutively, summed over the tokens.
+
+        Only entries in the positional postings of the rarest token are checked; for each, the start
+        positions of the phrase are narrowed token by token until none are left.
+        """
+        postings = [self.positions.get(token) for token in tokens]
+        if not all(postings):
+            return {}
+        by_size = sorted(postings, key=len)
+
+        scores: Dict[int, float] = {}
+        for entry_id in by_size[0]:
+            if any(entry_id not in token_positions for token_positions in by_size[1:]):
+                continue
+            starts = set(postings[0][entry_id])
+            for offset in range(1, len(tokens)):
+                starts.intersection_update(position - offset for position in postings[offset][entry_id])
+                if not starts:
+                    break
+            if starts:
+                scores[entry_id] = sum(self._exact_score(token, entry_id) for token in tokens)
+        return scores
+
+    def _excluded_ids(self, query: Query) -> Set[int]:
+        """Return the ids of the entries containing an excluded term (as a prefix) or phrase."""
+        excluded: Set[int] = set()
+        for term in query.excluded_terms:
+            for token in self._prefix_tokens(term):
+                excluded.update(self.positions[token])
+        for phrase in query.excluded_phrases:
+            excluded.update(self._score_phrase(phrase))
+        return excluded
+
+    def _merge_synonyms(self, term_units: List[Dict[int, float]], synonyms: Sequence[Synonym]) -> List[Dict[int, float]]:
+        """
+        Return the units to intersect: each run of terms with synonyms becomes one unit scoring
+        entries that match all of those terms, or all tokens of one of their synonyms at its weight.
+        """
+        units = []
+        covered: Set[int] = set()
+        for start, end, alternatives in synonym_spans(synonyms):
+            unit = _intersect(term_units[start:end])
+            for tokens, weight in alternatives:
+                for entry_id, score in _intersect([self._score_term(token) for token in tokens]).items():
+                    if weight * score > unit.get(entry_id, 0.0):
+                        unit[entry_id] = weight * score
+            units.append(unit)
+            covered.update(range(start, end))
+        return units + [unit for position, unit in enumerate(term_units) if position not in covered]
+
+    def _allowed_ids(self, query: Query, categories: Optional[Collection[str]]) -> Optional[FrozenSet[int]]:
+        """Return the ids the query's category filters and the given categories allow, or None for all."""
+        allowed = self.scope(categories) if categories is not None else None
+        if query.categories is not None:
+            filtered = self.scope(query.categories)
+            allowed = filtered if allowed is None else allowed & filtered
+        if query.excluded_categories:
+            if allowed is None:
+                allowed = self.scope(self.category_ids)
+            allowed = allowed - self.scope(query.excluded_categories)
+        return allowed
+
+    def search(self, query: Union[str, Query], limit: int = 5, categories: Optional[Collection[str]] = None,
+               expansions: Sequence[Tuple[str, float]] = (),
+               synonyms: Sequence[Synonym] = ()) -> List[Document]:
+        """
+        Find entries matching every term and phrase of the query, best matches first.
+
+        The smallest posting list is intersected with the others, so the work is bounded by the rarest
+        term or phrase. A synonym is an alternative to the terms it replaces, so "sniper mech" runs as
+        sniper AND (mech OR hound), and is found even when those terms match something by prefix or typo.
+        When nothing matches, entries matching any of the terms or any of the weighted expansion terms
+        are ranked instead. Excluded terms, phrases and categories never match, and an entry and its
+        sub-sections take one result between them.
+
+        Args:
+            query (Union[str, Query]): Search query string, parsed with the index's category filters, or a parsed Query
+            limit (int): Maximum number of entries to return
+            categories (Optional[Collection[str]]): Only search entries from these categories
+            expansions (Sequence[Tuple[str, float]]): Weighted (term, weight) pairs for the any-term fallback
+            synonyms (Sequence[Synonym]): (start, end, tokens, weight) synonyms of runs of the query's terms
+
+        Returns:
+            list: Matching documents ordered by relevance
+        """
+        if isinstance(query, str):
+            query = parse_query(query, self.filters)
+        if not query and not expansions:
+            return []
+
+        allowed = self._allowed_ids(query, categories)
+        if len(query.terms) == 1 and not (query.phrases or query.excluded_terms or query.excluded_phrases or synonyms):
+            top = self._top_term(query.terms[0], limit, allowed)
+            if top or not expansions:
+                return [self.documents[-negative_id] for _, negative_id in top]
+
+        term_units = [self._score_term(term) for term in query.terms]
+        phrase_units = [self._score_phrase(phrase) for phrase in query.phrases]
+        units = self._merge_synonyms(term_units, synonyms) + phrase_units
+        excluded = self._excluded_ids(query)
+        scores: Dict[int, float] = {}
+        if units and all(units):
+            units.sort(key=len)
+            for entry_id, score in units[0].items():
+                if (allowed is not None and entry_id not in allowed) or entry_id in excluded:
+                    continue
+                for unit in units[1:]:
+                    unit_score = unit.get(entry_id)
+                    if unit_score is None:
+                        break
+                    score += unit_score
+                else:
+                    scores[entry_id] = score
+
+        def add_weighted(weighted: List[Tuple[Dict[int, float], float]]):
+            for unit, weight in weighted:
+                for entry_id, score in unit.items():
+                    if (allowed is None or entry_id in allowed) and entry_id not in excluded:
+                        scores[entry_id] = scores.get(entry_id, 0.0) + weight * score
+
+        if not scores:
+            add_weighted([(unit, 1.0) for unit in term_units + phrase_units] + [
+                (self._score_term(token), weight) for term, weight in expansions for token in tokenize(term)
+            ])
+
+        return [self.documents[-negative_id] for _, negative_id in self._top_per_group(scores, limit)]
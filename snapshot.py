@@ -0,0 +1,71 @@
+"""
+On-disk snapshots of the Chromehounds search index.
+Lets the plugin bulk-load a previously built index on startup instead of rebuilding it.
+"""
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from typing import Dict, Optional
+
+from . import documents, query, search
+from .search import SearchIndex
+
+# Bump when the snapshot layout changes so old files are ignored
+SNAPSHOT_FORMAT = 3
+
+# Default snapshot location, next to the plugin sources
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "search_index.snapshot")
+
+
+def corpus_hash(search_spaces: Dict[str, dict], field_weights: Optional[Dict[str, float]] = None) -> str:
+    """
+    Hash everything the index is built from: the corpus, the field weights and the indexer source.
+    A snapshot is only reused while this hash is unchanged.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"format:{SNAPSHOT_FORMAT}".encode())
+    digest.update(json.dumps(search_spaces, sort_keys=True, default=str).encode())
+    digest.update(json.dumps(field_weights or search.FIELD_WEIGHTS, sort_keys=True).encode())
+    for module in (documents, query, search):
+        with open(module.__file__, "rb") as source:
+            digest.update(source.read())
+    return digest.hexdigest()
+
+
+def save_snapshot(index: SearchIndex, content_hash: str, path: str = DEFAULT_SNAPSHOT_PATH):
+    """Write the index to `path` atomically, tagged with the corpus hash."""
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temp_path = tempfile.mkstemp(prefix=".snapshot-", dir=directory)
+    try:
+        with os.fdopen(handle, "wb") as snapshot:
+            pickle.dump(
+                {"format": SNAPSHOT_FORMAT, "hash": content_hash, "index": index},
+                snapshot,
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def load_snapshot(content_hash: str, path: str = DEFAULT_SNAPSHOT_PATH) -> Optional[SearchIndex]:
+    """
+    Load the index saved at `path` if it was built from the same corpus.
+
+    Returns:
+        Optional[SearchIndex]: The stored index, or None if it is missing, stale or unreadable
+    """
+    try:
+        with open(path, "rb") as snapshot:
+            payload = pickle.load(snapshot)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+
+    if not isinstance(payload, dict) or payload.get("format") != SNAPSHOT_FORMAT or payload.get("hash") != content_hash:
+        return None
+    index = payload.get("index")
+    return index if isinstance(index, SearchIndex) else None
@@ -0,0 +1,230 @@
+"""
+SQLite storage backend for the Chromehounds search.
+Keeps the corpus and an FTS5 full-text index in a single database file instead of in memory.
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Collection, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .documents import Document, iter_documents
+from .query import Query, Synonym, parse_query, synonym_spans, tokenize
+from .search import FIELD_WEIGHTS, entry_fields
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    key TEXT NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    sections TEXT NOT NULL,
+    parent INTEGER,
+    path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_category ON entries (category);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5 (title, body, nested);
+"""
+
+
+class SQLiteSearchIndex:
+    """
+    Search index stored in an SQLite database with an FTS5 table, ranked with FTS5's bm25().
+
+    Offers the same search interface as SearchIndex, but documents are only read from disk
+    when they are returned, so search results don't hold the corpus in memory. The categories
+    the plugin lists topics or renders fixed-key embeds from are still read in and kept.
+    """
+
+    COLUMNS = "entries.id, entries.category, entries.key, entries.title, entries.body, entries.sections, entries.parent, entries.path"
+    GROUPED_COLUMNS = "id, category, key, title, body, sections, parent, path"
+
+    def __init__(self, path: str, search_spaces: Optional[Dict[str, dict]] = None,
+                 field_weights: Optional[Dict[str, float]] = None, version: int = 0):
+        self.path = path
+        self.version = version
+        self.field_weights = dict(FIELD_WEIGHTS if field_weights is None else field_weights)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+        if search_spaces is not None:
+            self.load(search_spaces)
+
+    @classmethod
+    def build(cls, path: str, search_spaces: Dict[str, dict], version: int = 0) -> "SQLiteSearchIndex":
+        """
+        Build a database for the search spaces next to `path`, then move it into place.
+
+        Indexes still open on the previous file keep reading it until they are dropped,
+        so searches in flight never see a half-loaded database.
+        """
+        handle, temp_path = tempfile.mkstemp(prefix=".search-", dir=os.path.dirname(os.path.abspath(path)))
+        os.close(handle)
+        index = None
+        try:
+            index = cls(temp_path, search_spaces, version=version)
+            os.replace(temp_path, path)
+        except BaseException:
+            if index is not None:
+                index.close()
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        index.path = path
+        return index
+
+    def load(self, search_spaces: Dict[str, dict]):
+        """Replace the stored corpus with the given search spaces."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM entries")
+            self._connection.execute("DELETE FROM entries_fts")
+            for document in iter_documents(search_spaces):
+                fields = entry_fields(document)
+                self._connection.execute(
+                    "INSERT INTO entries (id, category, key, title, body, sections, parent, path) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (document.id, document.category, document.key, document.title, document.body,
+                     json.dumps(document.sections), document.parent, json.dumps(document.path))
+                )
+                self._connection.execute(
+                    "INSERT INTO entries_fts (rowid, title, body, nested) VALUES (?, ?, ?, ?)",
+                    (document.id, " ".join(fields["title"]), " ".join(fields["body"]), " ".join(fields["nested"]))
+                )
+
+    @staticmethod
+    def _document(row: tuple) -> Document:
+        document_id, category, key, title, body, sections, parent, path = row
+        return Document(document_id, category, key, title, body,
+                        tuple((label, tuple(items)) for label, items in json.loads(sections)),
+                        parent, tuple(json.loads(path)))
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def iter_entries(self) -> Iterator[Document]:
+        """Yield every stored document in corpus order."""
+        with self._lock:
+            rows = self._connection.execute(f"SELECT {self.COLUMNS} FROM entries ORDER BY id").fetchall()
+        for row in rows:
+            yield self._document(row)
+
+    def iter_category(self, category: str) -> Iterator[Document]:
+        """Yield the stored documents of one category in corpus order."""
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {self.COLUMNS} FROM entries WHERE category = ? ORDER BY id", (category,)
+            ).fetchall()
+        for row in rows:
+            yield self._document(row)
+
+    def estimate_cost(self, query: str) -> float:
+        """Queries go to disk, so they are always worth running off the event loop."""
+        return float("inf")
+
+    def _query(self, match: str, limit: int, categories: Optional[Collection[str]],
+               excluded_categories: Collection[str] = ()) -> List[Document]:
+        weights = [self.field_weights.get(field, 0.0) for field in ("title", "body", "nested")]
+        sql = (
+            f"SELECT {self.COLUMNS}, bm25(entries_fts, ?, ?, ?) AS rank "
+            "FROM entries_fts JOIN entries ON entries.id = entries_fts.rowid WHERE entries_fts MATCH ?"
+        )
+        params: list = weights + [match]
+        if categories is not None:
+            categories = list(categories)
+            if not categories:
+                return []
+            sql += f" AND entries.category IN ({', '.join('?' for _ in categories)})"
+            params.extend(categories)
+        if excluded_categories:
+            excluded_categories = list(excluded_categories)
+            sql += f" AND entries.category NOT IN ({', '.join('?' for _ in excluded_categories)})"
+            params.extend(excluded_categories)
+        # Only the best of an entry and its sub-sections, as the in-memory index does
+        sql = (
+            f"SELECT {self.GROUPED_COLUMNS} FROM ("
+            "SELECT *, ROW_NUMBER() OVER (PARTITION BY COALESCE(parent, id) ORDER BY rank, id) AS group_rank "
+            f"FROM ({sql})) WHERE group_rank = 1 ORDER BY rank, id LIMIT ?"
+        )
+        params.append(limit)
+
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return [self._document(row) for row in rows]
+
+    def find_title(self, title: str, categories: Optional[Collection[str]] = None) -> List[Document]:
+        """Return the entries titled exactly `title` (ignoring case), optionally only from some categories."""
+        sql = f"SELECT {self.COLUMNS} FROM entries WHERE title = ? COLLATE NOCASE"
+        params: list = [title.strip()]
+        if categories is not None:
+            categories = list(categories)
+            if not categories:
+                return []
+            sql += f" AND category IN ({', '.join('?' for _ in categories)})"
+            params.extend(categories)
+        with self._lock:
+            rows = self._connection.execute(sql + " ORDER BY id", params).fetchall()
+        return [self._document(row) for row in rows]
+
+    def _filters(self) -> Dict[str, Tuple[str, ...]]:
+        with self._lock:
+            rows = self._connection.execute("SELECT DISTINCT category FROM entries").fetchall()
+        return {category: (category,) for category, in rows}
+
+    def search(self, query: Union[str, Query], limit: int = 5, categories: Optional[Collection[str]] = None,
+               expansions: Sequence[Tuple[str, float]] = (),
+               synonyms: Sequence[Synonym] = ()) -> List[Document]:
+        """
+        Find entries matching every term (as a token prefix) and phrase of the query, best matches first.
+
+        The query compiles to an FTS5 expression: terms become prefix queries, phrases FTS5 phrases
+        and exclusions a NOT clause, with each synonym OR-ed in as an alternative to the terms it replaces.
+        When nothing matches, entries matching any of the terms or any of the expansion terms are returned
+        instead. FTS5 can't weight individual terms, so the weights only decide which terms are included.
+
+        Args:
+            query (Union[str, Query]): Search query string, parsed with the stored categories as filters, or a parsed Query
+            limit (int): Maximum number of entries to return
+            categories (Optional[Collection[str]]): Only search entries from these categories
+            expansions (Sequence[Tuple[str, float]]): Weighted (term, weight) pairs for the any-term fallback
+            synonyms (Sequence[Synonym]): (start, end, tokens, weight) synonyms of runs of the query's terms
+
+        Returns:
+            list: Matching documents ordered by relevance
+        """
+        if isinstance(query, str):
+            query = parse_query(query, self._filters())
+        if categories is not None and query.categories is not None:
+            categories = set(categories) & query.categories
+        elif query.categories is not None:
+            categories = query.categories
+
+        terms = [f'"{term}"*' for term in query.terms]
+        units = list(terms)
+        for start, end, alternatives in reversed(synonym_spans(synonyms)):
+            options = [terms[start:end]] + [[f'"{token}"*' for token in tokens]
+                                            for tokens, weight in alternatives if weight > 0]
+            units[start:end] = ["(" + " OR ".join(f"({' AND '.join(option)})" for option in options) + ")"]
+        units += [f'"{" ".join(phrase)}"' for phrase in query.phrases]
+        excluded = [f'"{term}"*' for term in query.excluded_terms]
+        excluded += [f'"{" ".join(phrase)}"' for phrase in query.excluded_phrases]
+        exclusion = f" NOT ({' OR '.join(excluded)})" if excluded else ""
+
+        results = []
+        if units:
+            results = self._query(f"({' AND '.join(units)}){exclusion}", limit, categories,
+                                  query.excluded_categories)
+        if not results:
+            units = terms + [f'"{" ".join(phrase)}"' for phrase in query.phrases]
+            units += [f'"{token}"*' for term, weight in expansions if weight > 0 for token in tokenize(term)]
+            if len(units) > 1 or (units and expansions):
+                results = self._query(f"({' OR '.join(units)}){exclusion}", limit, categories,
+                                      query.excluded_categories)
+        return results
@@ -0,0 +1,58 @@
+"""
+Query parser tests for the Chromehounds plugin.
+Run from the bot's directory with `python -m pytest plugins/Chromehounds/tests`.
+"""
+import random
+
+import pytest
+
+from plugins.Chromehounds.query import normalize_query, parse_query
+
+SCOPES = {"nations": ("nations",), "parts": ("equipment", "roles")}
+
+
+def test_parse_query():
+    query = parse_query('sniper "heavy armor" -hover -"reverse jointed" nations: -parts:', SCOPES)
+    assert query.terms == ["sniper"]
+    assert query.phrases == [("heavy", "armor")]
+    assert query.excluded_terms == ["hover"]
+    assert query.excluded_phrases == [("reverse", "jointed")]
+    assert query.categories == {"nations"}
+    assert query.excluded_categories == {"equipment", "roles"}
+
+
+def test_unknown_field_is_a_word():
+    assert parse_query('foo:"x y"', SCOPES).terms == ["foo"]
+    assert parse_query("foo:bar", SCOPES).terms == ["foo", "bar"]
+    excluded = parse_query("-foo:bar", SCOPES)
+    assert excluded.excluded_terms == ["foo", "bar"]
+    assert not excluded.excluded_phrases
+
+
+@pytest.mark.parametrize("text", [
+    "-foo:a-b",
+    "foo:a-b",
+    '-foo:"a b"',
+    "-nations:a-b",
+    "nations:tarakia",
+    "reverse-jointed",
+    "-reverse-jointed",
+    '"unterminated phrase',
+    "a:b:c",
+    "-a:b:c",
+    "--x",
+    'a"b',
+    "foo:!!!",
+    "Sniper  BUILD!"
+])
+def test_normalized_query_parses_the_same(text):
+    assert parse_query(normalize_query(text), SCOPES) == parse_query(text, SCOPES)
+    assert normalize_query(normalize_query(text)) == normalize_query(text)
+
+
+def test_normalized_query_parses_the_same_random():
+    rng = random.Random(0)
+    pieces = ["a", "b", "-", ":", '"', " ", "nations", "parts", "foo", "x_y", "!", "2"]
+    for _ in range(5000):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 12)))
+        assert parse_query(normalize_query(text), SCOPES) == parse_query(text, SCOPES), text
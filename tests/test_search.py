@@ -0,0 +1,36 @@
+"""
+Search ranking tests for the Chromehounds plugin.
+Run from the bot's directory with `python -m pytest plugins/Chromehounds/tests`.
+"""
+from plugins.Chromehounds import data
+from plugins.Chromehounds.search import entry_fields
+
+
+def _tokens(document):
+    return {token for tokens in entry_fields(document).values() for token in tokens}
+
+
+def test_synonym_outranks_typo_match():
+    # "arty" is one typo away from "art", but its synonym "artillery" is what was meant
+    results = data.search_chromehounds_data("arty")
+    assert results
+    assert "artillery" in _tokens(results[0])
+
+
+def test_synonym_applies_when_query_has_no_match():
+    results = data.search_chromehounds_data("treads")
+    assert any("caterpillar" in _tokens(document) for document in results)
+
+
+def test_synonym_only_replaces_its_own_term():
+    # "hound" stands in for "mech", but every result must still match "sniper"
+    results = data.search_chromehounds_data("sniper mech")
+    assert results
+    for document in results:
+        assert any(token.startswith("sniper") for token in _tokens(document))
+
+
+def test_entry_and_its_sections_take_one_result():
+    results = data.search_chromehounds_data("morskoj")
+    groups = [document.id if document.parent is None else document.parent for document in results]
+    assert len(groups) == len(set(groups))